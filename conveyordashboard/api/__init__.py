@@ -12,7 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
+
 from django.conf import settings
+from django.utils import timezone
 
 from horizon import exceptions
 from oslo_log import log as logging
@@ -23,6 +27,73 @@ from conveyorclient import client
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_CLIENT_POOL_SIZE = 64
+
+
+class ClientPool(object):
+    """Per-process LRU pool of conveyor clients.
+
+    Clients are keyed by (endpoint, token, insecure), so a client is only
+    ever shared by requests carrying the same token. Reusing the client
+    keeps its HTTP connections alive between calls instead of paying a new
+    TLS handshake on every API call of a page.
+    """
+
+    def __init__(self, max_size=DEFAULT_CLIENT_POOL_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _expired(expires):
+        return expires is not None and expires <= timezone.now()
+
+    def _evict_expired(self):
+        for key, (c, expires) in list(self._clients.items()):
+            if self._expired(expires):
+                del self._clients[key]
+                self.evictions += 1
+
+    def get(self, key, expires, factory):
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None and not self._expired(entry[1]):
+                self._clients[key] = entry
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self.evictions += 1
+
+        c = factory()
+
+        with self._lock:
+            self.misses += 1
+            self._evict_expired()
+            self._clients[key] = (c, expires)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+        return c
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._clients),
+                    'max_size': self.max_size,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+CLIENT_POOL = ClientPool(getattr(settings, 'CONVEYOR_CLIENT_POOL_SIZE',
+                                 DEFAULT_CLIENT_POOL_SIZE))
+
 
 def _get_endpoint(request):
     endpoint = getattr(settings, 'CONVEYOR_API_URL', None)
@@ -36,14 +107,42 @@ def _get_endpoint(request):
     return endpoint
 
 
-def conveyorclient(request):
-    endpoint = _get_endpoint(request)
-    insecure = True
-    getattr(settings, 'CONVEYOR_API_INSECURE', False)
-
-    token_id = request.user.token.id
+def _create_client(endpoint, token_id, insecure):
     c = client.Client(1, endpoint=endpoint, token=token_id,
                       insecure=insecure)
-    c.client.auth_token = request.user.token.id
+    c.client.auth_token = token_id
     c.client.management_url = endpoint
     return c
+
+
+def client_credentials(request):
+    """Return what conveyorclient_for needs to call conveyor for request.
+
+    Unlike the request, the credentials can be kept by threads outliving
+    it.
+    """
+    endpoint = _get_endpoint(request)
+    insecure = True
+    getattr(settings, 'CONVEYOR_API_INSECURE', False)
+
+    token = request.user.token
+    return endpoint, token.id, insecure, getattr(token, 'expires', None)
+
+
+def conveyorclient_for(credentials):
+    endpoint, token_id, insecure, expires = credentials
+    if not CLIENT_POOL.max_size:
+        return _create_client(endpoint, token_id, insecure)
+
+    return CLIENT_POOL.get((endpoint, token_id, insecure),
+                           expires,
+                           lambda: _create_client(endpoint, token_id,
+                                                  insecure))
+
+
+def conveyorclient(request):
+    return conveyorclient_for(client_credentials(request))
+
+
+def client_pool_stats():
+    return CLIENT_POOL.stats()
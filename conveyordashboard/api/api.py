@@ -11,17 +11,47 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import bisect
+import copy
+import json
+import threading
+import time
+import uuid
+
 from django.conf import settings
 from django.contrib.staticfiles.templatetags.staticfiles import static
+from django.core.cache import cache
 from horizon.utils import functions as utils
 from openstack_dashboard import api as os_api
+from oslo_log import log as logging
 
 from conveyordashboard import api
+from conveyordashboard import exceptions
 from conveyordashboard.api import models
 from conveyordashboard.common import constants as consts
+from conveyordashboard.common import utils as conveyor_utils
+
+LOG = logging.getLogger(__name__)
 
 RESOURCE_TYPE_IMAGE_MAPPINGS = consts.RESOURCE_TYPE_IMAGE_MAPPINGS
 
+REQUEST_CACHE_ATTR = '_conveyor_api_cache'
+REQUEST_CACHE_SAVED_ATTR = '_conveyor_api_cache_saved'
+
+SHARED_CACHE_PREFIX = 'conveyordashboard:resources'
+CATALOG_CACHE_PREFIX = 'conveyordashboard:catalog'
+TOPO_CACHE_PREFIX = 'conveyordashboard:topo'
+PLAN_INDEX_PREFIX = 'conveyordashboard:plan_index'
+
+SUBNET_FILTER_MAX_NETWORKS = 100
+
+# Resource types owned by users rather than projects, their cached lists
+# are not shared between the users of a project.
+USER_SCOPED_TYPES = (consts.NOVA_KEYPAIR,)
+
+_catalog_refreshing = set()
+_catalog_refreshing_lock = threading.Lock()
+
 
 def update_pagination(entities, page_size, marker, sort_dir):
     has_more_data, has_prev_data = False, False
@@ -40,6 +70,54 @@ def update_pagination(entities, page_size, marker, sort_dir):
     return entities, has_more_data, has_prev_data
 
 
+def paginated(request, list_func, search_opts=None, **kwargs):
+    """Fetch one page of a list through list_func.
+
+    The 'paginate', 'marker' and 'sort_dir' options are taken out of
+    search_opts and translated into the marker/limit/sort_dir options
+    understood by conveyor. list_func must accept a search_opts keyword
+    argument. Returns (entities, has_more_data, has_prev_data).
+    """
+    search_opts = dict(search_opts or {})
+    paginate = search_opts.pop('paginate', False)
+    marker = search_opts.pop('marker', None)
+    sort_dir = search_opts.pop('sort_dir', 'desc')
+
+    if not paginate:
+        return list(list_func(request, search_opts=search_opts, **kwargs)), \
+            False, False
+
+    page_size = utils.get_page_size(request)
+    search_opts['limit'] = page_size + 1
+    search_opts['sort_dir'] = sort_dir
+    if marker is not None:
+        search_opts['marker'] = marker
+
+    entities = list(list_func(request, search_opts=search_opts, **kwargs))
+    return update_pagination(entities, page_size, marker, sort_dir)
+
+
+def paginate_list(request, entities, marker=None, sort_dir='desc',
+                  key='id'):
+    """Take one page out of a fully fetched list, like paginated does.
+
+    entities are in listing order. Pages going back ('asc' sort_dir) come
+    in reverse order, as from conveyor. key is the item of entities the
+    marker refers to. Returns (entities, has_more_data, has_prev_data).
+    """
+    page_size = utils.get_page_size(request)
+    keys = [e[key] for e in entities]
+    if marker is not None and marker not in keys:
+        marker = None
+        sort_dir = 'desc'
+    if sort_dir == 'asc' and marker is not None:
+        page = entities[:keys.index(marker)][::-1][:page_size + 1]
+    else:
+        start = 0 if marker is None else keys.index(marker) + 1
+        page = entities[start:start + page_size + 1]
+    return update_pagination(page, page_size, marker, sort_dir)
+
+
 def get_resource_image(res_type, color='green'):
     if res_type not in RESOURCE_TYPE_IMAGE_MAPPINGS:
         res_type = 'UNKNOWN'
@@ -77,24 +155,145 @@ def plan_list(request, search_opts=None):
 
 def plan_create(request, plan_type, resources,
                 plan_name=None):
-    return models.Plan(api.conveyorclient(request).plans.create(
+    plan = models.Plan(api.conveyorclient(request).plans.create(
         plan_type, resources, plan_name=plan_name))
+    invalidate_resource_cache(request)
+    invalidate_plan_index(request)
+    return plan
 
 
 def plan_delete(request, plan_id):
-    return api.conveyorclient(request).plans.delete(plan_id)
+    result = api.conveyorclient(request).plans.delete(plan_id)
+    invalidate_plan_index(request)
+    return result
 
 
 def plan_get(request, plan_id):
     return models.Plan(api.conveyorclient(request).plans.get(plan_id))
 
 
+def plans_get(request, plan_ids):
+    """Return {plan_id: plan} for the plans of plan_ids that exist.
+
+    The plans are fetched concurrently, at most
+    CONVEYOR_PLAN_STATUS_CONCURRENCY at once, so that the cost depends on
+    the number of plans asked for and not on the size of the project.
+    """
+    def _get(plan_id):
+        try:
+            return plan_id, plan_get(request, plan_id)
+        except exceptions.NOT_FOUND:
+            return plan_id, None
+
+    limit = getattr(settings, 'CONVEYOR_PLAN_STATUS_CONCURRENCY', 8)
+    return dict((plan_id, plan) for plan_id, plan in
+                conveyor_utils.bounded_map(_get, sorted(set(plan_ids)),
+                                           limit, 'plans')
+                if plan is not None)
+
+
 def download_template(request, plan_id):
     return api.conveyorclient(request).plans.download_template(plan_id)
 
 
 def create_plan_by_template(request, template):
-    return api.conveyorclient(request).plans.create_plan_by_template(template)
+    result = api.conveyorclient(request).plans.create_plan_by_template(
+        template)
+    invalidate_plan_index(request)
+    return result
+
+
+def _plan_index_key(request):
+    project_id = str(request.user.tenant_id)
+    generation = cache.get(
+        ':'.join([PLAN_INDEX_PREFIX, 'generation', project_id]), '')
+    return ':'.join([PLAN_INDEX_PREFIX, project_id, generation])
+
+
+def invalidate_plan_index(request):
+    """Drop the plan search index of the current project."""
+    project_id = str(request.user.tenant_id)
+    cache.set(':'.join([PLAN_INDEX_PREFIX, 'generation', project_id]),
+              uuid.uuid4().hex, None)
+
+
+def _build_plan_index(plans):
+    plans = sorted(plans, key=lambda p: getattr(p, 'created_at', None) or '',
+                   reverse=True)
+    names = [(getattr(p, 'plan_name', None) or '').lower() for p in plans]
+    statuses = {}
+    for pos, plan in enumerate(plans):
+        status = (getattr(plan, 'plan_status', None) or '').lower()
+        statuses.setdefault(status, []).append(pos)
+    return {'plans': [_freeze_resource(p) for p in plans],
+            'ids': [p.plan_id for p in plans],
+            'names': names,
+            'sorted_names': sorted((name, pos)
+                                   for pos, name in enumerate(names)),
+            'statuses': statuses}
+
+
+def _plan_index(request):
+    """Return the search index of the plans of the current project.
+
+    The index holds every plan, newest first, along with their lower case
+    names, sorted for prefix lookups, and positions by status. It is kept
+    in the Django cache for CONVEYOR_PLAN_INDEX_TTL seconds and rebuilt
+    when plans are created or deleted.
+    """
+    ttl = getattr(settings, 'CONVEYOR_PLAN_INDEX_TTL', 30)
+    key = _plan_index_key(request)
+    index = cache.get(key) if ttl else None
+    if index is None:
+        index = _build_plan_index(
+            api.conveyorclient(request).plans.list({}))
+        if ttl:
+            cache.set(key, index, ttl)
+    return index
+
+
+def _plan_index_search(index, field, query):
+    query = query.lower()
+    if field == 'plan_status':
+        return index['statuses'].get(query, [])
+
+    # Plans whose name starts with query come first, then the plans whose
+    # name only contains it.
+    sorted_names = index['sorted_names']
+    prefix = []
+    for name, pos in sorted_names[bisect.bisect_left(sorted_names,
+                                                     (query,)):]:
+        if not name.startswith(query):
+            break
+        prefix.append(pos)
+    prefix.sort()
+    found = set(prefix)
+    return prefix + [pos for pos, name in enumerate(index['names'])
+                     if query in name and pos not in found]
+
+
+def plan_search(request, field, query, marker=None, sort_dir='desc'):
+    """Search the plans of the project, one page at a time.
+
+    field is 'plan_name', matched by prefix then substring, or
+    'plan_status', matched exactly, both ignoring case. The conveyor API
+    only filters plans by exact name, so plans are searched in the cached
+    project index. Returns (plans, has_more_data, has_prev_data) like
+    plan_list.
+    """
+    index = _plan_index(request)
+    hits = _plan_index_search(index, field, query)
+    page_size = utils.get_page_size(request)
+
+    ids = [index['ids'][pos] for pos in hits]
+    start = ids.index(marker) if marker in ids else None
+    if sort_dir == 'asc':
+        page = hits[:start][::-1] if start is not None else []
+    else:
+        page = hits[start + 1:] if start is not None else hits
+    plans = [models.Plan(_thaw_resource(index['plans'][pos]))
+             for pos in page[:page_size + 1]]
+    return update_pagination(plans, page_size, marker, sort_dir)
 
 
 def list_clone_resources_attribute(request, plan_id, attribute_name):
@@ -102,21 +301,297 @@ def list_clone_resources_attribute(request, plan_id, attribute_name):
         .list_clone_resources_attribute(plan_id, attribute_name)
 
 
-def build_resources_topo(request, plan_id, az_map, search_opt=None):
-    return api.conveyorclient(request)\
-        .resources.build_resources_topo(plan_id, az_map, search_opt=search_opt)
+def resources_topo_version(request, plan_id, az_map, search_opt=None):
+    """Return a digest identifying the topology of a plan.
+
+    It changes whenever the plan is updated, and is used both as the
+    topology cache key and as its ETag.
+    """
+    plan = plan_get(request, plan_id)
+    raw = json.dumps([plan_id, az_map, plan.updated_at, search_opt],
+                     sort_keys=True)
+    return conveyor_utils.md5(raw.encode('utf-8'))
+
+
+def build_resources_topo(request, plan_id, az_map, search_opt=None,
+                         version=None):
+    ttl = getattr(settings, 'CONVEYOR_TOPO_CACHE_TTL', 600)
+    if not ttl:
+        return api.conveyorclient(request).resources.build_resources_topo(
+            plan_id, az_map, search_opt=search_opt)
+
+    if version is None:
+        version = resources_topo_version(request, plan_id, az_map,
+                                         search_opt=search_opt)
+    key = ':'.join([TOPO_CACHE_PREFIX, version])
+    topo = cache.get(key)
+    if topo is None:
+        topo = api.conveyorclient(request).resources.build_resources_topo(
+            plan_id, az_map, search_opt=search_opt)
+        cache.set(key, topo, ttl)
+    return topo
+
+
+def _normalize_search_opts(search_opts):
+    if not search_opts:
+        return ()
+    return tuple(sorted((k, repr(v)) for k, v in search_opts.items()
+                        if k != 'type'))
+
+
+def _request_cache(request):
+    cache = getattr(request, REQUEST_CACHE_ATTR, None)
+    if cache is None:
+        cache = {}
+        setattr(request, REQUEST_CACHE_ATTR, cache)
+    return cache
 
 
-def resource_list(request, resource_type, search_opts=None):
+def _request_cached(request, key, fetch):
+    """Serve key from the cache bound to request, fetching it on a miss.
+
+    Identical resource lookups issued while serving one request cost a
+    single backend call. The number of calls saved that way is kept on the
+    request and reported at debug level.
+    """
+    cache = _request_cache(request)
+    if key in cache:
+        saved = getattr(request, REQUEST_CACHE_SAVED_ATTR, 0) + 1
+        setattr(request, REQUEST_CACHE_SAVED_ATTR, saved)
+        LOG.debug("Request cache hit for %s, %d backend calls saved.",
+                  key, saved)
+        return cache[key]
+    cache[key] = value = fetch()
+    return value
+
+
+def request_cache_saved_calls(request):
+    return getattr(request, REQUEST_CACHE_SAVED_ATTR, 0)
+
+
+def _shared_cache_ttl(resource_type):
+    ttls = getattr(settings, 'CONVEYOR_RESOURCE_CACHE_TTL', {})
+    return ttls.get(resource_type, ttls.get('default', 0))
+
+
+def _shared_cache_generation_key(project_id):
+    return ':'.join([SHARED_CACHE_PREFIX, 'generation', str(project_id)])
+
+
+def cache_scope(request, resource_type=None):
+    """Return who a cached list of resource_type may be shared with.
+
+    Lists of USER_SCOPED_TYPES are kept per user. Others are shared by the
+    users of the project holding the same roles, since roles such as admin
+    widen what is listed.
+    """
+    if resource_type in USER_SCOPED_TYPES:
+        return 'user-%s' % request.user.id
+    roles = sorted(role['name'] for role in request.user.roles)
+    return 'roles-%s' % conveyor_utils.md5(
+        json.dumps(roles).encode('utf-8'))
+
+
+def _shared_cache_key(request, resource_type, search_opts):
+    project_id = request.user.tenant_id
+    generation = resource_cache_generation(request)
+    raw = repr((resource_type, _normalize_search_opts(search_opts)))
+    return ':'.join([SHARED_CACHE_PREFIX, str(project_id), generation,
+                     cache_scope(request, resource_type),
+                     conveyor_utils.md5(raw.encode('utf-8'))])
+
+
+def _freeze_resource(res):
+    # Client resources hold a reference to their manager, which can not be
+    # pickled. Keep only the class and the raw info of the resource.
+    info = getattr(res, '_info', None)
+    if info is None:
+        return None, res
+    return res.__class__, info
+
+
+def _thaw_resource(frozen):
+    cls, info = frozen
+    if cls is None:
+        return info
+    return cls(None, info, loaded=True)
+
+
+def _copy_resource(res):
+    # Copy the raw info only, the manager of a client resource is shared.
+    cls, info = _freeze_resource(res)
+    return _thaw_resource((cls, copy.deepcopy(info)))
+
+
+def resource_cache_generation(request):
+    """Return a token changing whenever the project resources are reset."""
+    return cache.get(_shared_cache_generation_key(request.user.tenant_id),
+                     '')
+
+
+def invalidate_resource_cache(request):
+    """Drop every shared resource list cached for the current project."""
+    cache.set(_shared_cache_generation_key(request.user.tenant_id),
+              uuid.uuid4().hex, None)
+
+
+def _list_resources(request, search_opts, ttl=None):
+    resource_type = search_opts['type']
+    if ttl is None:
+        ttl = _shared_cache_ttl(resource_type)
+    if not ttl:
+        return api.conveyorclient(request).resources.list(search_opts)
+
+    key = _shared_cache_key(request, resource_type, search_opts)
+    frozen = cache.get(key)
+    if frozen is not None:
+        return [_thaw_resource(f) for f in frozen]
+    resources = list(api.conveyorclient(request).resources.list(search_opts))
+    cache.set(key, [_freeze_resource(r) for r in resources], ttl)
+    return resources
+
+
+def resource_list(request, resource_type, search_opts=None, ttl=None):
+    """List resources of resource_type.
+
+    ttl, when given, overrides CONVEYOR_RESOURCE_CACHE_TTL for this list.
+    The resources are shared with the later lookups of the request,
+    callers changing them change copies, see _copy_resource.
+    """
     if not search_opts:
         search_opts = {}
     search_opts['type'] = resource_type
-    return api.conveyorclient(request).resources.list(search_opts)
+    key = ('list', resource_type, _normalize_search_opts(search_opts))
+    resources = _request_cached(
+        request, key, lambda: _list_resources(request, search_opts, ttl))
+    return list(resources)
 
 
 def resource_get(request, res_type, res_id):
-    return api.conveyorclient(request).resources.get_resource_detail(res_type,
-                                                                     res_id)
+    # Callers update the returned resource in place, hand out a copy.
+    resource = _request_cached(
+        request, ('get', res_type, res_id),
+        lambda: api.conveyorclient(request).resources.get_resource_detail(
+            res_type, res_id))
+    return copy.deepcopy(resource)
+
+
+def resource_get_batch(request, resources):
+    """Get the detail of several (res_type, res_id) pairs at once.
+
+    Duplicate pairs are fetched once and the lookups run concurrently.
+    Returns a dict of (res_type, res_id) to resource, resources that can
+    not be retrieved are left out.
+    """
+    resources = list(set(resources))
+
+    def _get(res):
+        res_type, res_id = res
+        try:
+            return res, resource_get(request, res_type, res_id)
+        except Exception as e:
+            LOG.info("Unable to retrieve %s %s: %s", res_type, res_id, e)
+            return res, None
+
+    executor = conveyor_utils.get_executor('batch')
+    return dict((res, detail) for res, detail in executor.map(_get, resources)
+                if detail is not None)
+
+
+def _catalog_cache_key(request, res_type):
+    # Private flavors and images are only listed to some projects or roles.
+    return ':'.join([CATALOG_CACHE_PREFIX, str(request.user.tenant_id),
+                     cache_scope(request, res_type), res_type])
+
+
+def _load_catalog(credentials, res_type, key):
+    resources = list(api.conveyorclient_for(credentials).resources.list(
+        {'type': res_type}))
+    cache.set(key,
+              {'loaded_at': time.time(),
+               'items': [_freeze_resource(r) for r in resources]},
+              getattr(settings, 'CONVEYOR_CATALOG_TTL', 3600))
+    return resources
+
+
+def _refresh_catalog(request, res_type, key):
+    with _catalog_refreshing_lock:
+        if key in _catalog_refreshing:
+            return
+        _catalog_refreshing.add(key)
+    # The refresh may outlive request, it only keeps the credentials.
+    credentials = api.client_credentials(request)
+
+    def _refresh():
+        try:
+            _load_catalog(credentials, res_type, key)
+        except Exception as e:
+            LOG.warning("Unable to refresh %s catalog: %s", res_type, e)
+        finally:
+            with _catalog_refreshing_lock:
+                _catalog_refreshing.discard(key)
+
+    conveyor_utils.get_executor('catalog').submit(_refresh)
+
+
+def _index_ids(resources, res_ids):
+    return dict((str(k), r) for k, r in
+                conveyor_utils.index_by(resources, 'id').items()
+                if str(k) in res_ids)
+
+
+def _list_ids(request, res_type, res_ids):
+    """Get the resources of res_type whose id is in res_ids, by id.
+
+    They are listed with a single call filtered on id. Nothing shows that
+    conveyor hands a list of ids on to nova or glance, so only the listed
+    resources asked for are kept, and those missing are fetched one by
+    one.
+    """
+    found = _index_ids(resource_list(request, res_type,
+                                     search_opts={'id': sorted(res_ids)}),
+                       res_ids)
+    missing = [(res_type, res_id) for res_id in res_ids
+               if res_id not in found]
+    for (_type, res_id), res in resource_get_batch(request,
+                                                   missing).items():
+        found[res_id] = res
+    return found
+
+
+def catalog_lookup(request, res_type, res_ids):
+    """Look up catalog resources such as flavors or images by id.
+
+    Catalogs are kept in the Django cache for CONVEYOR_CATALOG_TTL seconds
+    and refreshed in the background once older than
+    CONVEYOR_CATALOG_REFRESH seconds. When the catalog is not cached and
+    only a few ids are needed, just those ids are listed and the catalog
+    is loaded in the background. Returns a dict of id to resource.
+    """
+    res_ids = set(str(i) for i in res_ids if i)
+    if not res_ids:
+        return {}
+
+    key = _catalog_cache_key(request, res_type)
+    catalog = cache.get(key)
+    if catalog is None:
+        threshold = getattr(settings, 'CONVEYOR_CATALOG_BATCH_THRESHOLD', 10)
+        if len(res_ids) <= threshold:
+            _refresh_catalog(request, res_type, key)
+            return _list_ids(request, res_type, res_ids)
+        resources = _load_catalog(api.client_credentials(request),
+                                  res_type, key)
+    else:
+        refresh = getattr(settings, 'CONVEYOR_CATALOG_REFRESH', 300)
+        if time.time() - catalog['loaded_at'] > refresh:
+            _refresh_catalog(request, res_type, key)
+        resources = [_thaw_resource(f) for f in catalog['items']]
+
+    found = _index_ids(resources, res_ids)
+    missing = res_ids - set(found)
+    if missing:
+        found.update(_list_ids(request, res_type, missing))
+    return found
 
 
 def clone(request, plan_id, destination, clone_resources,
@@ -128,12 +603,14 @@ def clone(request, plan_id, destination, clone_resources,
         replace_resources = []
     if clone_links is None:
         clone_links = []
-    return api.conveyorclient(request).clones.clone(
+    result = api.conveyorclient(request).clones.clone(
         plan_id, destination, clone_resources,
         update_resources=update_resources, clone_links=clone_links,
         replace_resources=replace_resources,
         sys_clone=sys_clone, copy_data=copy_data
     )
+    invalidate_resource_cache(request)
+    return result
 
 
 def export_migrate_template(request, plan_id):
@@ -142,7 +619,10 @@ def export_migrate_template(request, plan_id):
 
 
 def migrate(request, plan_id, destination):
-    return api.conveyorclient(request).migrates.migrate(plan_id, destination)
+    result = api.conveyorclient(request).migrates.migrate(plan_id,
+                                                          destination)
+    invalidate_resource_cache(request)
+    return result
 
 
 def server_list(request, search_opts=None, all_tenants=False):
@@ -187,50 +667,136 @@ def volume_list(request, search_opts=None):
     return [models.Volume(v) for v in volumes]
 
 
-def net_list(request, search_opts=None):
-    networks = resource_list(request, consts.NEUTRON_NET,
-                             search_opts=search_opts)
-    subnets = resource_list(request, consts.NEUTRON_SUBNET)
-    subnet_dict = dict([(s.id, s) for s in subnets])
+def _attach_subnets(request, networks, ttl=None):
+    """Return copies of networks with their subnet objects as subnets.
+
+    Only the subnets of the given networks are listed, filtered on
+    network_id. Past SUBNET_FILTER_MAX_NETWORKS networks the filter would
+    not fit in a request URL and all subnets are listed instead. Nothing
+    shows that conveyor hands a list of network ids on to neutron, so all
+    subnets are listed as well when the filtered listing misses subnets
+    of the networks. Subnets are matched by the ids the networks hold.
+    """
+    networks = [_copy_resource(n) for n in networks]
+    wanted = set(s for n in networks
+                 for s in getattr(n, 'subnets', None) or [])
+    if not wanted:
+        return networks
+
+    net_ids = sorted(set(n.id for n in networks))
+    subnets = None
+    if len(net_ids) <= SUBNET_FILTER_MAX_NETWORKS:
+        subnets = resource_list(request, consts.NEUTRON_SUBNET,
+                                search_opts={'network_id': net_ids},
+                                ttl=ttl)
+        if not wanted.issubset(s.id for s in subnets):
+            subnets = None
+    if subnets is None:
+        subnets = resource_list(request, consts.NEUTRON_SUBNET, ttl=ttl)
+    subnet_dict = conveyor_utils.index_by(subnets, 'id')
     for n in networks:
-        setattr(n, 'subnets',
-                [subnet_dict[s] for s in getattr(n, 'subnets', [])
-                 if s in subnet_dict])
+        n.subnets = [subnet_dict[s] for s in getattr(n, 'subnets', [])
+                     if s in subnet_dict]
     return networks
 
 
-def net_list_for_tenant(request, tenant_id, search_opts=None):
-    nets = net_list(request, search_opts)
-    return [os_api.neutron.Network(n.__dict__) for n in nets
-            if n.shared or n.tenant_id == tenant_id]
-
-
-def subnet_list(request, search_opts=None):
+def net_list(request, search_opts=None):
+    networks = resource_list(request, consts.NEUTRON_NET,
+                             search_opts=search_opts)
+    return _attach_subnets(request, networks)
+
+
+def subnets_get(request, subnet_ids):
+    """Get several subnets by id with a single backend call.
+
+    Subnets already fetched while serving this request are not fetched
+    again. Returns a dict of id to subnet detail, like resource_get.
+
+    Nothing shows that conveyor hands a list of ids on to neutron. Only
+    the listed subnets asked for are kept, and subnets missing from the
+    listing are fetched one by one.
+    """
+    cache = _request_cache(request)
+    subnets = {}
+    missing = set()
+    for subnet_id in subnet_ids:
+        key = ('get', consts.NEUTRON_SUBNET, subnet_id)
+        if key in cache:
+            subnets[subnet_id] = copy.deepcopy(cache[key])
+        else:
+            missing.add(subnet_id)
+
+    if missing:
+        search_opts = {'id': sorted(missing)}
+        for sn in resource_list(request, consts.NEUTRON_SUBNET,
+                                search_opts=search_opts):
+            info = getattr(sn, '_info', sn)
+            if info['id'] not in missing:
+                continue
+            cache[('get', consts.NEUTRON_SUBNET, info['id'])] = info
+            subnets[info['id']] = copy.deepcopy(info)
+        found = resource_get_batch(
+            request, [(consts.NEUTRON_SUBNET, subnet_id)
+                      for subnet_id in missing.difference(subnets)])
+        for (_type, subnet_id), subnet in found.items():
+            subnets[subnet_id] = subnet
+    return subnets
+
+
+def net_list_for_tenant(request, tenant_id, search_opts=None, ttl=None):
+    """List the networks of tenant_id and the shared ones.
+
+    Foreign networks are dropped before their subnets are looked up. When
+    search_opts holds a limit, listing goes on after the last network
+    seen until limit networks are kept or the list is exhausted, so that
+    pages are not cut short by foreign networks.
+    """
+    search_opts = dict(search_opts or {})
+    limit = search_opts.get('limit')
+    nets = []
+    while True:
+        listed = resource_list(request, consts.NEUTRON_NET,
+                               search_opts=dict(search_opts), ttl=ttl)
+        nets.extend(n for n in listed
+                    if n.shared or n.tenant_id == tenant_id)
+        if not limit or len(listed) < limit or len(nets) >= limit:
+            break
+        search_opts['marker'] = listed[-1].id
+    if limit:
+        nets = nets[:limit]
+    # The networks are copies, Network can wrap their attribute dict.
+    return [os_api.neutron.Network(n.__dict__)
+            for n in _attach_subnets(request, nets, ttl=ttl)]
+
+
+def subnet_list(request, search_opts=None, ttl=None):
     if search_opts is None:
         search_opts = {}
 
     subnets = resource_list(request, consts.NEUTRON_SUBNET,
-                            search_opts=search_opts)
+                            search_opts=search_opts, ttl=ttl)
     return [os_api.neutron.Subnet(sn.__dict__) for sn in subnets]
 
 
-def sg_list(request, tenant_id=None, search_opts=None):
+def sg_list(request, tenant_id=None, search_opts=None, ttl=None):
     if search_opts is None:
         search_opts = {}
     if tenant_id:
         search_opts['tenant_id'] = tenant_id
     secgroups = resource_list(request, consts.NEUTRON_SECGROUP,
-                              search_opts=search_opts)
+                              search_opts=search_opts, ttl=ttl)
     sgs = [sg.__dict__ for sg in secgroups]
     return [os_api.neutron.SecurityGroup(sg) for sg in sgs]
 
 
-def pool_list(request, **kwargs):
+def pool_list(request, search_opts=None, **kwargs):
     pools = [p.get('pools') for p in
-             resource_list(request, consts.NEUTRON_POOL)]
+             resource_list(request, consts.NEUTRON_POOL,
+                           search_opts=search_opts)]
     return [os_api.lbaas.Pool(p) for p in pools]
 
 
-def stack_list(request, **kwargs):
-    stacks = resource_list(request, consts.HEAT_STACK)
+def stack_list(request, search_opts=None, **kwargs):
+    stacks = resource_list(request, consts.HEAT_STACK,
+                           search_opts=search_opts)
     return [models.Stack(s) for s in stacks]
@@ -13,7 +13,10 @@
 #    under the License.
 
 import json
+import time
 
+from django import http
+from django.conf import settings
 from django.views import generic
 
 from openstack_dashboard.api.rest import urls
@@ -22,10 +25,16 @@ from openstack_dashboard.api.rest import utils as rest_utils
 from oslo_log import log as logging
 
 from conveyordashboard.api import api
+from conveyordashboard.api import watch
+from conveyordashboard.common import utils
 from conveyordashboard.plans import resources
+from conveyordashboard.plans import topology
 
 LOG = logging.getLogger(__name__)
 
+# Seconds between two messages of an idle event stream.
+SSE_HEARTBEAT = 15
+
 
 @urls.register
 class Plans(generic.View):
@@ -48,6 +57,88 @@ class Plans(generic.View):
         return plan.to_dict()
 
 
+@urls.register
+class PlanStatuses(generic.View):
+    """Status of many plans, polled by the plans table in one request."""
+    url_regex = r'conveyor/plans/statuses/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        plan_ids = [i for i in request.GET.get('ids', '').split(',') if i]
+        max_size = getattr(settings, 'CONVEYOR_RESOURCE_BATCH_SIZE', 200)
+        if len(plan_ids) > max_size:
+            raise rest_utils.AjaxError(
+                400, 'At most %d plans can be requested at once.' % max_size)
+        plans = api.plans_get(request, plan_ids)
+        return {'items': [{'plan_id': p.plan_id,
+                           'plan_status': p.plan_status,
+                           'task_status': p.task_status}
+                          for p in plans.values()]}
+
+
+def _sse_message(event, data, event_id):
+    return 'event: %s\nid: %s\ndata: %s\n\n' % (event, event_id,
+                                                json.dumps(data))
+
+
+def _plan_event_stream(subscription, cursor):
+    """Stream status transitions as server-sent events.
+
+    The stream ends after CONVEYOR_PLAN_WATCH_STREAM_TIMEOUT seconds, the
+    browser then reconnects, resuming from the id of the last event.
+    subscription is the result of watch.subscription.
+    """
+    yield 'retry: %d\n\n' % (watch.poll_interval() * 1000)
+    deadline = time.time() + getattr(
+        settings, 'CONVEYOR_PLAN_WATCH_STREAM_TIMEOUT', 300)
+    while time.time() < deadline:
+        watcher = watch.subscribe(*subscription)
+        cursor, events, statuses = watcher.wait(cursor, SSE_HEARTBEAT)
+        if statuses is not None:
+            yield _sse_message('snapshot', statuses, cursor)
+        for event in events:
+            yield _sse_message('status', event, watcher.cursor(event['seq']))
+        if statuses is None and not events:
+            yield ': keepalive\n\n'
+
+
+@urls.register
+class PlanEvents(generic.View):
+    """Plan status transitions of the project.
+
+    Browsers accepting text/event-stream get server-sent events, others
+    long-poll: each GET waits up to CONVEYOR_PLAN_WATCH_TIMEOUT seconds for
+    transitions after the cursor parameter and returns the next cursor.
+    Either way, the status of every plan is sent instead when the cursor
+    can not be resumed from. Only served when watch.enabled().
+    """
+    url_regex = r'conveyor/plans/events/$'
+
+    def get(self, request):
+        if not watch.enabled():
+            raise http.Http404()
+        if 'text/event-stream' not in request.META.get('HTTP_ACCEPT', ''):
+            return self._long_poll(request)
+        if not request.user.is_authenticated():
+            return http.HttpResponse(status=401)
+        cursor = request.META.get('HTTP_LAST_EVENT_ID')
+        response = http.StreamingHttpResponse(
+            _plan_event_stream(watch.subscription(request), cursor),
+            content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Keep proxies like nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @rest_utils.ajax()
+    def _long_poll(self, request):
+        watcher = watch.get_watcher(request)
+        cursor, events, statuses = watcher.wait(
+            request.GET.get('cursor'),
+            getattr(settings, 'CONVEYOR_PLAN_WATCH_TIMEOUT', 25))
+        return {'cursor': cursor, 'items': events, 'statuses': statuses}
+
+
 @urls.register
 class ResourceDetailFromPlan(generic.View):
     container = 'plans/res_detail/_balloon_container.html'
@@ -65,13 +156,150 @@ class ResourceDetailFromPlan(generic.View):
                 'image': api.get_resource_image(res_type, 'red')}
 
 
+@urls.register
+class ResourceDetailProperties(generic.View):
+    """Normalized properties of a plan resource, for its client template.
+
+    Only types of resources.CLIENT_TEMPLATES are served, the balloons of
+    other types are rendered by ResourceDetailFromPlan.
+    """
+    url_regex = r'conveyor/plans/(?P<plan_id>[^/]+)/detail_resource/' \
+                r'(?P<res_id>[^/]+)/properties/$'
+
+    @rest_utils.ajax()
+    def post(self, request, plan_id, res_id):
+        res_type = request.DATA['resource_type']
+        if res_type.split('::')[-1].lower() not in resources.CLIENT_TEMPLATES:
+            raise rest_utils.AjaxError(
+                400, 'No client template for %s.' % res_type)
+        context = resources.DetailResourceView(
+            request, plan_id, res_type, res_id,
+            request.DATA).properties()
+        result = dict((k, v) for k, v in context.items()
+                      if k != 'template_name')
+        result['image'] = api.get_resource_image(res_type, 'red')
+        return result
+
+
+@urls.register
+class ResourceDetailTemplates(generic.View):
+    """Client templates of resource balloons by type, already translated.
+
+    Browsers fetch them once and revalidate them with their ETag.
+    """
+    url_regex = r'conveyor/plans/detail_templates/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        templates = resources.client_templates()
+        return _conditional_response(
+            request, templates['version'],
+            lambda: {'templates': templates['templates']})
+
+
+def _conditional_response(request, version, build):
+    """Answer 304 when the client holds version, else the JSON of build()."""
+    etag = '"%s"' % version
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if etag in [t.strip() for t in if_none_match.split(',')]:
+        response = http.HttpResponseNotModified()
+    else:
+        response = rest_utils.JSONResponse(build())
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _topo_result(topo, compact, **extra):
+    """Return topo with its layout, in the compact format if asked."""
+    layout = topology.get_layout(topo)
+    if compact:
+        result = {'topo': topology.compact_topology(topo, layout)}
+    else:
+        result = {'topo': topo, 'layout': layout}
+    result.update(extra)
+    return result
+
+
 @urls.register
 class BuildResourceTopo(generic.View):
+    """Topology of a plan with its layout.
+
+    With format=compact the topology is encoded by
+    topology.compact_topology, the layout included.
+    """
     url_regex = r'conveyor/plans/(?P<plan_id>[^/]+)/build_resources_topo/$'
 
     @rest_utils.ajax()
     def get(self, request, plan_id):
         search_opts, kwargs = rest_utils.parse_filters_kwargs(
-            request, ['availability_zone_map'])
+            request, ['availability_zone_map', 'format'])
+        az_map = json.loads(kwargs['availability_zone_map'])
+        compact = kwargs.get('format') == topology.COMPACT_FORMAT
+        topo_version = api.resources_topo_version(request, plan_id, az_map)
+        version = topo_version + ('-compact' if compact else '')
+
+        def build():
+            topo = api.build_resources_topo(request, plan_id, az_map,
+                                            version=topo_version)
+            return _topo_result(topo, compact)
+
+        return _conditional_response(request, version, build)
+
+
+@urls.register
+class ResourceTopoNodes(generic.View):
+    """Full nodes of a plan topology, for topologies fetched compact.
+
+    ids is a comma separated list of node ids.
+    """
+    url_regex = r'conveyor/plans/(?P<plan_id>[^/]+)/topo_nodes/$'
+
+    @rest_utils.ajax()
+    def get(self, request, plan_id):
+        search_opts, kwargs = rest_utils.parse_filters_kwargs(
+            request, ['availability_zone_map', 'ids'])
+        az_map = json.loads(kwargs['availability_zone_map'])
+        ids = set(i for i in (kwargs.get('ids') or '').split(',') if i)
+        topo = api.build_resources_topo(request, plan_id, az_map)
+        return {'items': [node for node in topo if node['id'] in ids]}
+
+
+@urls.register
+class ClusteredResourceTopo(generic.View):
+    """Plan topology with resources collapsed into clusters.
+
+    Only topologies of more than CONVEYOR_TOPO_CLUSTER_THRESHOLD resources
+    are clustered. mode is one of topology.CLUSTER_MODES, expanded a JSON
+    list of the cluster ids to show resource by resource. format=compact
+    asks for the encoding of BuildResourceTopo.
+    """
+    url_regex = r'conveyor/plans/(?P<plan_id>[^/]+)/clustered_topo/$'
+
+    @rest_utils.ajax()
+    def get(self, request, plan_id):
+        search_opts, kwargs = rest_utils.parse_filters_kwargs(
+            request, ['availability_zone_map', 'mode', 'expanded', 'format'])
         az_map = json.loads(kwargs['availability_zone_map'])
-        return {'topo': api.build_resources_topo(request, plan_id, az_map)}
+        mode = kwargs.get('mode') or 'type'
+        if mode not in topology.CLUSTER_MODES:
+            raise rest_utils.AjaxError(400, 'Unknown cluster mode %s' % mode)
+        expanded = sorted(json.loads(kwargs.get('expanded') or '[]'))
+        compact = kwargs.get('format') == topology.COMPACT_FORMAT
+
+        topo_version = api.resources_topo_version(request, plan_id, az_map)
+        version = utils.md5(
+            json.dumps([topo_version, mode, expanded,
+                        compact]).encode('utf-8'))
+
+        def build():
+            topo = api.build_resources_topo(request, plan_id, az_map,
+                                            version=topo_version)
+            threshold = getattr(settings, 'CONVEYOR_TOPO_CLUSTER_THRESHOLD',
+                                200)
+            clustered = len(topo) > threshold
+            if clustered:
+                topo = topology.cluster_topology(topo, mode, expanded)
+            return _topo_result(topo, compact, clustered=clustered)
+
+        return _conditional_response(request, version, build)
@@ -12,19 +12,58 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.conf import settings
 from django.views import generic
 from openstack_dashboard import api as os_api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
+from oslo_log import log
+import six
 
 from conveyordashboard.api import api
 from conveyordashboard.security_groups.tables import RulesTable
 from conveyordashboard.security_groups import utils as secgroup_utils
 
-from oslo_log import log
 LOG = log.getLogger(__name__)
 
 
+# NOTE: conveyor/resources/batch/ also matches the single segment pattern
+# of Resources, with 'batch' as resource type. Django uses the first
+# pattern registered that matches, so this one must stay ahead.
+@urls.register
+class ResourceBatch(generic.View):
+    url_regex = r'conveyor/resources/batch/$'
+
+    @rest_utils.ajax(data_required=True)
+    def post(self, request):
+        """Get the detail of several resources in one call.
+
+        The body is {"resources": [{"type": ..., "id": ...}, ...]}, the
+        resources are resolved concurrently. Resources that can not be
+        retrieved come back with a null resource.
+        """
+        resources = request.DATA.get('resources', []) \
+            if isinstance(request.DATA, dict) else None
+        if not isinstance(resources, list) or not all(
+                isinstance(r, dict) and
+                isinstance(r.get('type'), six.string_types) and
+                isinstance(r.get('id'), six.string_types)
+                for r in resources):
+            raise rest_utils.AjaxError(
+                400, 'resources must be a list of {"type": ..., "id": ...}.')
+        wanted = [(r['type'], r['id']) for r in resources]
+        max_size = getattr(settings, 'CONVEYOR_RESOURCE_BATCH_SIZE', 200)
+        if len(wanted) > max_size:
+            raise rest_utils.AjaxError(
+                400, 'At most %d resources can be requested at once.'
+                % max_size)
+        found = api.resource_get_batch(request, wanted)
+        return {'items': [{'type': res_type,
+                           'id': res_id,
+                           'resource': found.get((res_type, res_id))}
+                          for res_type, res_id in wanted]}
+
+
 @urls.register
 class Resource(generic.View):
     url_regex = r'conveyor/resources/(?P<res_type>[^/]+)/(?P<res_id>[^/]+)/$'
@@ -0,0 +1,209 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared watch of the plan statuses of a project.
+
+Only used when CONVEYOR_PLAN_WATCH_EVENTS is set: subscribers hold a
+server thread while they wait, which needs an asynchronous, e.g. gevent,
+WSGI worker. Otherwise browsers poll the statuses of their rows.
+
+Browsers following plan statuses subscribe to the PlanWatcher of their
+project. One thread per watched project lists the plans every
+CONVEYOR_PLAN_WATCH_INTERVAL seconds and queues the status transitions for
+all subscribers. Processes sharing the Django cache also share the listing,
+so a project is polled once per interval whatever the number of browsers.
+"""
+
+import collections
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from oslo_log import log as logging
+
+from conveyordashboard import api
+
+LOG = logging.getLogger(__name__)
+
+WATCH_CACHE_PREFIX = 'conveyordashboard:plan_watch'
+
+# Transitions kept for subscribers catching up after a reconnection.
+EVENT_BACKLOG = 1000
+
+# A project nobody subscribed to for that many seconds is no longer polled.
+IDLE_TIMEOUT = 60
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, 'CONVEYOR_PLAN_WATCH_EVENTS', False)
+
+
+def poll_interval():
+    return getattr(settings, 'CONVEYOR_PLAN_WATCH_INTERVAL', 5)
+
+
+def _status_item(plan_id, status):
+    plan_status, task_status = status or (None, None)
+    return {'plan_id': plan_id,
+            'plan_status': plan_status,
+            'task_status': task_status}
+
+
+class PlanWatcher(object):
+    """Status transitions of the plans of a project.
+
+    Subscribers follow transitions with an opaque cursor. A cursor this
+    watcher can not replay from, e.g. issued by another process or too
+    old, gets the status of every plan instead.
+    """
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.epoch = uuid.uuid4().hex
+        self.seq = 0
+        self.statuses = None
+        self.events = collections.deque(maxlen=EVENT_BACKLOG)
+        self.cond = threading.Condition()
+        self.credentials = None
+        self.last_seen = 0
+        self.thread = None
+
+    def touch(self, credentials):
+        """Record a subscriber, polling on its behalf until it goes idle."""
+        with self.cond:
+            self.credentials = credentials
+            self.last_seen = time.time()
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run,
+                    name='plan-watch-%s' % self.project_id)
+                self.thread.daemon = True
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            with _watchers_lock, self.cond:
+                if time.time() - self.last_seen > IDLE_TIMEOUT:
+                    # Transitions are no longer followed, cursors issued
+                    # so far can not be replayed from.
+                    self.thread = None
+                    self.statuses = None
+                    self.epoch = uuid.uuid4().hex
+                    self.events.clear()
+                    if _watchers.get(self.project_id) is self:
+                        del _watchers[self.project_id]
+                    return
+                credentials = self.credentials
+            try:
+                self._update(self._fetch(credentials))
+            except Exception:
+                LOG.exception("Unable to watch plans of project %s.",
+                              self.project_id)
+            time.sleep(poll_interval())
+
+    def _fetch(self, credentials):
+        """Return the plan statuses, listing plans once per interval."""
+        key = ':'.join([WATCH_CACHE_PREFIX, str(self.project_id)])
+        interval = poll_interval()
+        snapshot = cache.get(key)
+        if ((snapshot is None or snapshot['time'] + interval <= time.time())
+                and cache.add(key + ':lock', True, interval)):
+            plans = api.conveyorclient_for(credentials).plans.list({})
+            snapshot = {'time': time.time(),
+                        'statuses': dict((p.plan_id, (p.plan_status,
+                                                      p.task_status))
+                                         for p in plans)}
+            cache.set(key, snapshot, interval * 2)
+        return snapshot and snapshot['statuses']
+
+    def _update(self, statuses):
+        if statuses is None:
+            return
+        with self.cond:
+            if self.statuses is not None:
+                for plan_id in set(self.statuses).union(statuses):
+                    status = statuses.get(plan_id)
+                    if self.statuses.get(plan_id) != status:
+                        self.seq += 1
+                        event = _status_item(plan_id, status)
+                        event['seq'] = self.seq
+                        self.events.append(event)
+            self.statuses = statuses
+            self.cond.notify_all()
+
+    def cursor(self, seq=None):
+        return '%s:%d' % (self.epoch, self.seq if seq is None else seq)
+
+    def _replay_from(self, cursor):
+        epoch, _sep, seq = (cursor or '').partition(':')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self.events[0]['seq'] if self.events else self.seq + 1
+        if seq > self.seq or seq < oldest - 1:
+            return None
+        return seq
+
+    def wait(self, cursor, timeout):
+        """Wait up to timeout seconds for transitions after cursor.
+
+        Returns (cursor, events, statuses). statuses, the status of every
+        plan, is only set when the subscriber has to resynchronize.
+        """
+        deadline = time.time() + timeout
+        with self.cond:
+            while True:
+                if self.statuses is not None:
+                    since = self._replay_from(cursor)
+                    if since is None:
+                        return (self.cursor(), [],
+                                [_status_item(plan_id, status) for
+                                 plan_id, status in self.statuses.items()])
+                    events = [e for e in self.events if e['seq'] > since]
+                    if events:
+                        return self.cursor(), events, None
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return cursor, [], None
+                self.cond.wait(remaining)
+
+
+def subscription(request):
+    """Return the arguments of subscribe for request.
+
+    Only the project and the client credentials are kept, so that the
+    request can be released while its subscriber waits.
+    """
+    return request.user.tenant_id, api.client_credentials(request)
+
+
+def subscribe(project_id, credentials):
+    """Return the plan watcher of project_id, subscribed."""
+    with _watchers_lock:
+        watcher = _watchers.get(project_id)
+        if watcher is None:
+            watcher = _watchers[project_id] = PlanWatcher(project_id)
+        # Under the lock, lest the watcher be pruned once touched.
+        watcher.touch(credentials)
+    return watcher
+
+
+def get_watcher(request):
+    """Return the plan watcher of the project of request, subscribed."""
+    return subscribe(*subscription(request))
@@ -20,9 +20,10 @@ from horizon import tables
 from conveyordashboard.api import api
 from conveyordashboard.cgroups import tables as cgroup_tables
 from conveyordashboard.common import constants as consts
+from conveyordashboard.common import tables as common_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = cgroup_tables.VolumeCGroupsTable
     template_name = '_res_table.html'
     page_title = _("Consistency Groups")
@@ -30,8 +31,14 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         cgroups = []
         try:
-            cgroups = api.resource_list(self.request,
-                                        consts.CINDER_CONSISGROUP)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            cgroups, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.resource_list, search_opts,
+                              resource_type=consts.CINDER_CONSISGROUP)
+            if sort_dir == "asc":
+                cgroups.reverse()
         except Exception:
             exceptions.handle(self.request, _("Unable to retrieve "
                                               "volume consistency groups."))
@@ -12,6 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import operator
+
+from conveyordashboard.common import constants as consts
+
 INSTANCE_CLONE_STATE = ('SHUTOFF', 'ACTIVE')
 
 VOLUME_CLONE_STATE = ('available',)
@@ -21,3 +25,43 @@ NET_CLONE_STATE = ('ACTIVE',)
 STACK_CLONE_STATE = ('CREATE_COMPLETE',)
 
 POOL_CLONE_STATE = ('ACTIVE',)
+
+# Declarative clone state filters, per resource type:
+#   (attribute, clone states, search option, accepts several values)
+# A filter with a search option is sent to conveyor in search_opts so that
+# pages come back full. Nothing shows that conveyor hands every option, e.g.
+# lists of states, on to nova, cinder and neutron, so the filter is always
+# evaluated on the client as well. Single-valued search options are only
+# pushed down for a single state.
+CLONE_STATE_FILTERS = {
+    consts.NOVA_SERVER: ('status', INSTANCE_CLONE_STATE, 'status', True),
+    consts.CINDER_VOLUME: ('status', VOLUME_CLONE_STATE, 'status', False),
+    consts.NEUTRON_NET: ('status', NET_CLONE_STATE, 'status', True),
+    # Pools are nested in a single listed resource, conveyor would filter
+    # that resource instead of the pools.
+    consts.NEUTRON_POOL: ('status', POOL_CLONE_STATE, None, True),
+    # Heat filters on status and action separately.
+    consts.HEAT_STACK: ('stack_status', STACK_CLONE_STATE, None, False),
+}
+
+
+def clone_state_predicate(res_type):
+    """Return a client side predicate for the clone states of res_type."""
+    attr, states, _key, _multi = CLONE_STATE_FILTERS[res_type]
+    getter = operator.attrgetter(attr)
+    return lambda obj: getter(obj) in states
+
+
+def push_clone_state_filter(res_type, search_opts):
+    """Add the clone state filter of res_type to search_opts.
+
+    Returns the predicate the caller has to evaluate on the client side,
+    which is authoritative whether conveyor applied the filter or not, or
+    None when res_type has no clone state filter.
+    """
+    if res_type not in CLONE_STATE_FILTERS:
+        return None
+    attr, states, key, multi = CLONE_STATE_FILTERS[res_type]
+    if key is not None and (len(states) == 1 or multi):
+        search_opts[key] = list(states) if len(states) > 1 else states[0]
+    return clone_state_predicate(res_type)
@@ -56,18 +56,17 @@ class FilterTableMixin(object):
             LOG.error("%s object has no attribute 'tenant_id' ", obj.__class__)
         return tenant_id == self.request.user.tenant_id
 
-    def _instance_status_filter(self, instance):
-        return instance.status in resource_state.INSTANCE_CLONE_STATE
-
-    def _volume_status_filter(self, volume):
-        return volume.status in resource_state.VOLUME_CLONE_STATE
-
-    def _network_status_filter(self, net):
-        status = net.status
-        return status in resource_state.NET_CLONE_STATE
-
-    def _pool_status_filter(self, pool):
-        return pool.status in resource_state.POOL_CLONE_STATE
-
-    def _stack_status_filter(self, stack):
-        return stack.stack_status in resource_state.STACK_CLONE_STATE
+    def _list_clone_state(self, res_type, list_func, **kwargs):
+        """List the resources of res_type that are in a clone state.
+
+        The state filter is sent to conveyor where it supports it, and is
+        evaluated here in any case. list_func must accept search_opts.
+        """
+        search_opts = {}
+        status_filter = resource_state.push_clone_state_filter(res_type,
+                                                               search_opts)
+        resources = list_func(self.request, search_opts=search_opts,
+                              **kwargs)
+        if status_filter:
+            resources = filter(status_filter, resources)
+        return resources
@@ -12,10 +12,86 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+from concurrent import futures
 import hashlib
+import itertools
+import threading
+
+from django.conf import settings
+
+_executors = {}
+_executor_lock = threading.Lock()
+_process_executor = None
 
 
 def md5(string):
     _md5 = hashlib.md5()
     _md5.update(string)
     return _md5.hexdigest()
+
+
+def index_by(resources, key, unique=True):
+    """Index resources by the value of key for keyed joins.
+
+    key names an attribute, or a key for dict resources. When unique is
+    True each value maps to the first resource carrying it, otherwise to
+    the list of all of them. Resources without a value are left out.
+    """
+    index = {}
+    for res in resources:
+        if isinstance(res, dict):
+            value = res.get(key)
+        else:
+            value = getattr(res, key, None)
+        if value is None:
+            continue
+        if unique:
+            index.setdefault(value, res)
+        else:
+            index.setdefault(value, []).append(res)
+    return index
+
+
+def get_executor(name='default'):
+    """Return the thread pool of feature name, used to fan out API calls.
+
+    Each feature gets its own pool of CONVEYOR_API_THREAD_POOL_SIZE
+    threads, so that a slow feature can not starve the others.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = futures.ThreadPoolExecutor(
+                    getattr(settings, 'CONVEYOR_API_THREAD_POOL_SIZE', 8))
+    return executor
+
+
+def get_process_executor():
+    """Return the process wide process pool running CPU bound work."""
+    global _process_executor
+    if _process_executor is None:
+        with _executor_lock:
+            if _process_executor is None:
+                _process_executor = futures.ProcessPoolExecutor(
+                    getattr(settings, 'CONVEYOR_PROCESS_POOL_SIZE', 2))
+    return _process_executor
+
+
+def bounded_map(func, items, limit, name='default'):
+    """Yield func(item) for items, in order, running at most limit at once.
+
+    Calls run on the executor of feature name, only limit results are
+    pending at any time however many items there are.
+    """
+    executor = get_executor(name)
+    items = iter(items)
+    pending = collections.deque(executor.submit(func, item)
+                                for item in itertools.islice(items, limit))
+    while pending:
+        future = pending.popleft()
+        for item in itertools.islice(items, 1):
+            pending.append(executor.submit(func, item))
+        yield future.result()
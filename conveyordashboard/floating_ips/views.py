@@ -18,10 +18,11 @@ from horizon import tables
 
 from conveyordashboard.api import api
 from conveyordashboard.common import constants as consts
+from conveyordashboard.common import tables as common_tables
 from conveyordashboard.floating_ips import tables as fip_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = fip_tables.FloatingIPsTable
     template_name = '_res_table.html'
     page_title = _("Floating IPs")
@@ -29,7 +30,14 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         fips = []
         try:
-            fips = api.resource_list(self.request, consts.NEUTRON_FLOATINGIP)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            fips, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.resource_list, search_opts,
+                              resource_type=consts.NEUTRON_FLOATINGIP)
+            if sort_dir == "asc":
+                fips.reverse()
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve floating IP addresses."))
@@ -12,7 +12,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from django.utils.datastructures import SortedDict
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -39,11 +38,14 @@ class IndexView(tables.DataTableView):
         marker = self.request.GET.get(
             inst_tables.InstancesTable._meta.pagination_param, None)
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
+        status_filter = resource_state.push_clone_state_filter(
+            consts.NOVA_SERVER, search_opts)
         # Gather our instances
         try:
             instances, self._more = api.server_list(self.request,
                                                     search_opts=search_opts)
-            instances = filter(self._status_filter, instances)
+            if status_filter:
+                instances = filter(status_filter, instances)
         except Exception:
             self._more = False
             instances = []
@@ -51,23 +53,29 @@ class IndexView(tables.DataTableView):
                               _("Unable to retrieve instances."))
 
         if instances:
+            instances = list(instances)
+            flavor_ids = [instance.flavor.get('id') for instance in instances
+                          if isinstance(getattr(instance, 'flavor', None),
+                                        dict)]
+            image_ids = [instance.image.get('id') for instance in instances
+                         if isinstance(getattr(instance, 'image', None),
+                                       dict)]
             try:
-                flavors = api.resource_list(self.request, consts.NOVA_FLAVOR)
+                full_flavors = api.catalog_lookup(self.request,
+                                                  consts.NOVA_FLAVOR,
+                                                  flavor_ids)
             except Exception:
-                flavors = []
+                full_flavors = {}
                 exceptions.handle(self.request, ignore=True)
 
             try:
-                images = api.resource_list(self.request, consts.GLANCE_IMAGE)
+                image_map = api.catalog_lookup(self.request,
+                                               consts.GLANCE_IMAGE,
+                                               image_ids)
             except Exception:
-                images = []
+                image_map = {}
                 exceptions.handle(self.request, ignore=True)
 
-            full_flavors = SortedDict([(str(flavor.id), flavor)
-                                       for flavor in flavors])
-            image_map = SortedDict([(str(image.id), image)
-                                    for image in images])
-
             # Loop through instances to get flavor info.
             for instance in instances:
                 if hasattr(instance, 'image'):
@@ -78,13 +86,7 @@ class IndexView(tables.DataTableView):
 
                 try:
                     flavor_id = instance.flavor['id']
-                    if flavor_id in full_flavors:
-                        instance.full_flavor = full_flavors[flavor_id]
-                    else:
-                        instance.full_flavor = api.resource_get(
-                            self.request,
-                            consts.NOVA_FLAVOR,
-                            flavor_id)
+                    instance.full_flavor = full_flavors[flavor_id]
                 except Exception:
                     msg = ('Unable to retrieve flavor "%s" for instance "%s".'
                            % (flavor_id, instance.id))
@@ -100,6 +102,3 @@ class IndexView(tables.DataTableView):
                 if filter_field and filter_string:
                     filters[filter_field] = filter_string
         return filters
-
-    def _status_filter(self, instance):
-        return instance.status in resource_state.INSTANCE_CLONE_STATE
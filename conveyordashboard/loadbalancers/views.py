@@ -11,6 +11,8 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import copy
+
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -19,11 +21,13 @@ from openstack_dashboard import api as os_api
 
 from conveyordashboard.api import api
 from conveyordashboard.common import constants as consts
+from conveyordashboard.common import tables as common_tables
+from conveyordashboard.common import utils
 from conveyordashboard.common import resource_state
 from conveyordashboard.loadbalancers import tables as lb_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = lb_tables.PoolsTable
     template_name = '_res_table.html'
     page_title = _("Pools")
@@ -31,24 +35,46 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         pools = []
         try:
-            request = self.request
-            pools = api.resource_list(request, consts.NEUTRON_POOL)[0].pools
-            pools = [os_api.lbaas.Pool(p) for p in pools]
-            fips = None
+            marker, sort_dir = self._get_marker()
+            search_opts = {}
+            status_filter = resource_state.push_clone_state_filter(
+                consts.NEUTRON_POOL, search_opts)
+            # Conveyor can not page pools, see _list_pools: they are
+            # paged here.
+            pools = self._list_pools(self.request, search_opts)
+            if status_filter:
+                pools = [p for p in pools
+                         if status_filter(os_api.lbaas.Pool(p))]
+            pools, self._has_more_data, self._has_prev_data = \
+                api.paginate_list(self.request, pools, marker, sort_dir)
+            if sort_dir == "asc":
+                pools.reverse()
+            # Pools are shared with the request cache, vips get their fip.
+            pools = [os_api.lbaas.Pool(copy.deepcopy(p)) for p in pools]
+            fip_index = None
             for pool in pools:
                 if hasattr(pool, "vip") and pool.vip:
-                    if not fips:
+                    if fip_index is None:
                         fips = api.resource_list(self.request,
                                                  consts.NEUTRON_FLOATINGIP)
-                    vip_fip = [fip for fip in fips
-                               if fip.port_id == pool.vip.port_id]
+                        fip_index = utils.index_by(fips, 'port_id')
+                    vip_fip = fip_index.get(pool.vip.port_id)
                     if vip_fip:
-                        pool.vip.fip = vip_fip[0]
-            pools = filter(self._status_filter, pools)
+                        pool.vip.fip = vip_fip
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve pools list.'))
         return pools
 
-    def _status_filter(self, pool):
-        return pool.status in resource_state.POOL_CLONE_STATE
+    @staticmethod
+    def _list_pools(request, search_opts=None):
+        """List all the pools of the project.
+
+        Conveyor lists pools as a single resource holding all of them, a
+        marker or limit would apply to that one wrapper, not to the pools,
+        so they can not be paged by conveyor. With a
+        CONVEYOR_RESOURCE_CACHE_TTL for pools, going through the pages does
+        not list them again.
+        """
+        return api.resource_list(request, consts.NEUTRON_POOL,
+                                 search_opts=search_opts)[0].pools
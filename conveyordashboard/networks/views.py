@@ -18,11 +18,13 @@ from horizon import exceptions
 from horizon import tables
 
 from conveyordashboard.api import api
+from conveyordashboard.common import constants as consts
 from conveyordashboard.common import resource_state
+from conveyordashboard.common import tables as common_tables
 from conveyordashboard.networks import tables as network_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = network_tables.NetworksTable
     template_name = '_res_table.html'
     page_title = _("Networks")
@@ -30,9 +32,19 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         nets = []
         try:
-            nets = api.net_list_for_tenant(self.request,
-                                           self.request.user.tenant_id)
-            nets = filter(self._status_filter, nets)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            status_filter = resource_state.push_clone_state_filter(
+                consts.NEUTRON_NET, search_opts)
+            nets, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.net_list_for_tenant,
+                              search_opts,
+                              tenant_id=self.request.user.tenant_id)
+            if sort_dir == "asc":
+                nets.reverse()
+            if status_filter:
+                nets = filter(status_filter, nets)
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve network list."))
@@ -47,7 +59,3 @@ class IndexView(tables.DataTableView):
                 if filter_field and filter_string:
                     filters[filter_field] = filter_string
         return filters
-
-    def _status_filter(self, net):
-        status = net.status
-        return status in resource_state.NET_CLONE_STATE
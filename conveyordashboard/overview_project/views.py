@@ -12,9 +12,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
+from concurrent import futures
+from django.conf import settings
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
 from horizon import views
 from oslo_log import log as logging
 
@@ -22,6 +29,7 @@ from conveyordashboard.api import api
 from conveyordashboard.api import models
 from conveyordashboard.common import constants as consts
 from conveyordashboard.common import tables as conveyor_table
+from conveyordashboard.common import utils
 from conveyordashboard.overview_project import tables as overview_tables
 
 LOG = logging.getLogger(__name__)
@@ -35,26 +43,75 @@ class IndexView(views.HorizonTemplateView,
     def get_context_data(self, **kwargs):
         context = super(IndexView, self).get_context_data(**kwargs)
 
-        data = []
-        data.extend(self.get_instances_data())
-        data.extend(self.get_volumes_data())
-        data.extend(self.get_networks_data())
-        data.extend(self.get_floating_ips_data())
-        data.extend(self.get_security_groups_data())
-        data.extend(self.get_pools_data())
-        data.extend(self.get_stacks_data())
-
+        data = self.collect_data()
         data.reverse()
 
         context['table'] = overview_tables.ResTable(self.request, data=data)
         context['project_id'] = self.request.user.tenant_id
         return context
 
+    def collect_data(self):
+        """Run the per-type collectors concurrently.
+
+        Each collector handles its own errors, collectors that do not
+        answer within CONVEYOR_API_CALL_TIMEOUT seconds of their start are
+        skipped, as are those waiting as long for a thread of the pool.
+        Collectors run in the language of the request, which translation
+        only activates for the request thread.
+        """
+        collectors = (
+            (self.get_instances_data,
+             _("Timed out retrieving instances list.")),
+            (self.get_volumes_data,
+             _("Timed out retrieving volumes list.")),
+            (self.get_networks_data,
+             _("Timed out retrieving network list.")),
+            (self.get_floating_ips_data,
+             _("Timed out retrieving floating IP addresses.")),
+            (self.get_security_groups_data,
+             _("Timed out retrieving security groups.")),
+            (self.get_pools_data,
+             _("Timed out retrieving pools list.")),
+            (self.get_stacks_data,
+             _("Timed out retrieving stacks.")),
+        )
+        timeout = getattr(settings, 'CONVEYOR_API_CALL_TIMEOUT', 30)
+        language = translation.get_language()
+
+        started = [threading.Event() for _c in collectors]
+        started_at = {}
+
+        def _collect(i, collector):
+            started_at[i] = time.time()
+            started[i].set()
+            with translation.override(language):
+                return collector()
+
+        executor = utils.get_executor('overview')
+        jobs = [executor.submit(_collect, i, collector)
+                for i, (collector, _msg) in enumerate(collectors)]
+
+        data = []
+        for i, job in enumerate(jobs):
+            msg = collectors[i][1]
+            try:
+                if not started[i].wait(timeout):
+                    job.cancel()
+                    raise futures.TimeoutError()
+                data.extend(job.result(
+                    max(started_at[i] + timeout - time.time(), 0)))
+            except futures.TimeoutError:
+                LOG.warning(msg)
+                messages.error(self.request, msg)
+        return data
+
     def get_instances_data(self):
         try:
             res = []
-            instances = api.resource_list(self.request, consts.NOVA_SERVER)
-            for i in filter(self._instance_status_filter, instances):
+            instances = self._list_clone_state(
+                consts.NOVA_SERVER, api.resource_list,
+                resource_type=consts.NOVA_SERVER)
+            for i in instances:
                 res.append(models.OverviewResource({
                     'res_id': i.id,
                     'res_type': consts.NOVA_SERVER,
@@ -71,8 +128,10 @@ class IndexView(views.HorizonTemplateView,
     def get_volumes_data(self):
         try:
             res = []
-            volumes = api.resource_list(self.request, consts.CINDER_VOLUME)
-            for vol in filter(self._volume_status_filter, volumes):
+            volumes = self._list_clone_state(
+                consts.CINDER_VOLUME, api.resource_list,
+                resource_type=consts.CINDER_VOLUME)
+            for vol in volumes:
                 res.append(models.OverviewResource({
                     'res_id': vol.id,
                     'res_type': consts.CINDER_VOLUME,
@@ -88,9 +147,10 @@ class IndexView(views.HorizonTemplateView,
     def get_networks_data(self):
         try:
             res = []
-            nets = api.net_list_for_tenant(self.request,
-                                           self.request.user.tenant_id)
-            for net in filter(self._network_status_filter, nets):
+            nets = self._list_clone_state(
+                consts.NEUTRON_NET, api.net_list_for_tenant,
+                tenant_id=self.request.user.tenant_id)
+            for net in nets:
                 res.append(models.OverviewResource({
                     'res_id': net.id,
                     'res_type': consts.NEUTRON_NET,
@@ -153,8 +213,9 @@ class IndexView(views.HorizonTemplateView,
     def get_stacks_data(self):
         try:
             res = []
-            stacks = api.stack_list(self.request)
-            for stack in filter(self._stack_status_filter, stacks):
+            stacks = self._list_clone_state(consts.HEAT_STACK,
+                                            api.stack_list)
+            for stack in stacks:
                 res.append(models.OverviewResource({
                     'res_id': stack.id,
                     'res_type': consts.HEAT_STACK,
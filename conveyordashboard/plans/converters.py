@@ -0,0 +1,171 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Conversion of edited plan resources to the properties conveyor expects.
+
+Resource balloons send their fields as edited, e.g. metadata as key=value
+lines. FIELD_CONVERTERS declares by resource type how each field is
+converted, RESOURCE_CONVERTERS the conversions involving several fields.
+Both are compiled at import time into one function per type, so that
+converting a resource is a lookup and a pass over its declared fields.
+"""
+
+import json
+
+from oslo_utils import strutils
+import six
+
+from conveyordashboard.common import constants
+
+TAG_RES_TYPE = constants.TAG_RES_TYPE
+
+# Returned by a field converter to remove the field.
+DROP = object()
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _text(parse):
+    """Convert string values with parse, leave the others as they are."""
+    def convert(value):
+        if isinstance(value, six.string_types):
+            return parse(value)
+        return value
+    return convert
+
+
+def _drop(value):
+    return DROP
+
+
+def _lines(text):
+    """Return the stripped non empty lines of text."""
+    return [item.strip() for item in text.split('\n') if item.strip()]
+
+
+def _key_values(text):
+    """Parse key=value lines into a dict."""
+    result = {}
+    for item in text.split('\n'):
+        item = item.strip().split('=')
+        if len(item) > 1 or item[0]:
+            result[item[0]] = item[1] if len(item) > 1 else ''
+    return result
+
+
+def _records(*keys):
+    """Parse lines of comma separated values into dicts of keys."""
+    def parse(text):
+        return [dict(zip(keys, item.strip().split(',')))
+                for item in text.split('\n') if item.strip()]
+    return parse
+
+
+def _renamed(fields):
+    """Convert a dict whose keys map to (new key, converter) in fields.
+
+    A None converter keeps the value.
+    """
+    fields = tuple(fields.items())
+
+    def convert(value):
+        for key, (new_key, func) in fields:
+            if key in value:
+                item = value.pop(key)
+                value[new_key] = item if func is None else func(item)
+        return value
+    return convert
+
+
+def _rules(rules):
+    if isinstance(rules, six.string_types):
+        rules = _JSON_DECODER.decode(rules)
+    for r in rules:
+        r.pop('id', None)
+    return rules
+
+
+def _no_gateway(res):
+    if 'no_gateway' in res:
+        if res.pop('no_gateway'):
+            res['gateway_ip'] = None
+
+
+FIELD_CONVERTERS = {
+    constants.NOVA_SERVER: {
+        'metadata': _text(_key_values),
+    },
+    constants.CINDER_VOLUME: {
+        'metadata': _text(_key_values),
+        'size': int,
+    },
+    constants.NEUTRON_SUBNET: {
+        'from_network_id': _drop,
+        'allocation_pools': _text(_records('start', 'end')),
+        'host_routes': _text(_records('destination', 'nexthop')),
+        'dns_nameservers': _text(_lines),
+    },
+    constants.NEUTRON_NET: {
+        'value_specs': _renamed({
+            'router_external': ('router:external',
+                                strutils.bool_from_string),
+            'segmentation_id': ('provider:segmentation_id', int),
+            'physical_network': ('provider:physical_network', None),
+            'network_type': ('provider:network_type', None),
+        }),
+        'admin_state_up': strutils.bool_from_string,
+    },
+    constants.NEUTRON_SECGROUP: {
+        'rules': _rules,
+    },
+    constants.NEUTRON_FLOATINGIP: {
+        # NOTE: In heat, there is not floating_network_id property.
+        'floating_network_id': _drop,
+    },
+}
+
+RESOURCE_CONVERTERS = {
+    constants.NEUTRON_SUBNET: (_no_gateway,),
+}
+
+
+def _compile(fields, converters):
+    fields = tuple(fields.items())
+
+    def convert(res):
+        for converter in converters:
+            converter(res)
+        for key, func in fields:
+            if key in res:
+                value = func(res[key])
+                if value is DROP:
+                    del res[key]
+                else:
+                    res[key] = value
+    return convert
+
+
+_CONVERTERS = dict(
+    (res_type, _compile(FIELD_CONVERTERS.get(res_type, {}),
+                        RESOURCE_CONVERTERS.get(res_type, ())))
+    for res_type in set(FIELD_CONVERTERS).union(RESOURCE_CONVERTERS))
+
+
+def preprocess_update_resources(update_resources):
+    """Convert the edited fields of update_resources in place."""
+    converters = _CONVERTERS
+    for res in update_resources:
+        convert = converters.get(res[TAG_RES_TYPE])
+        if convert is not None:
+            convert(res)
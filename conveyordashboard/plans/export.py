@@ -0,0 +1,204 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Streaming export of plan templates.
+
+Templates are dumped as YAML by a producer thread into a small bounded
+queue, so that a response only holds a few chunks besides the template
+itself, and waits for slow clients instead of buffering the whole dump.
+Several plans are exported as a tar.gz archive written as a stream, their
+templates fetched a few at a time.
+"""
+
+import io
+import tarfile
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from oslo_log import log as logging
+from six.moves import queue
+import yaml
+
+from conveyordashboard import api
+from conveyordashboard.common import utils
+
+LOG = logging.getLogger(__name__)
+
+# The C emitter of libyaml, when PyYAML was built with it.
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Size in bytes of the chunks handed to the response.
+CHUNK_SIZE = 64 * 1024
+
+# Number of chunks dumped ahead of the client.
+QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class _Aborted(Exception):
+    pass
+
+
+class _ChunkWriter(object):
+    """File like object queuing what the YAML emitter writes by chunks."""
+
+    def __init__(self, chunks, abort):
+        self.chunks = chunks
+        self.abort = abort
+        self.buffer = []
+        self.size = 0
+
+    def write(self, data):
+        self.buffer.append(data)
+        self.size += len(data)
+        if self.size >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.put(b''.join(self.buffer))
+            self.buffer = []
+            self.size = 0
+
+    def put(self, item):
+        # Wait for the client, unless it went away.
+        while True:
+            if self.abort.is_set():
+                raise _Aborted()
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+
+def iter_yaml(data):
+    """Yield data dumped as UTF-8 YAML, by chunks of about CHUNK_SIZE."""
+    chunks = queue.Queue(QUEUE_SIZE)
+    abort = threading.Event()
+
+    def dump():
+        writer = _ChunkWriter(chunks, abort)
+        try:
+            try:
+                yaml.dump(data, writer, Dumper=YAML_DUMPER, encoding='utf-8')
+                writer.flush()
+                writer.put(_DONE)
+            except _Aborted:
+                raise
+            except Exception as e:
+                writer.put(e)
+        except _Aborted:
+            pass
+
+    thread = threading.Thread(target=dump, name='yaml-export')
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        abort.set()
+
+
+def iter_gzip(chunks, level=6):
+    """Gzip compress an iterable of byte chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request):
+    return (getattr(settings, 'CONVEYOR_EXPORT_GZIP', True) and
+            'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+
+class _ArchiveWriter(object):
+    """File like object keeping what tarfile writes until drained."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _archive_member(name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = time.time()
+    return info, io.BytesIO(data)
+
+
+def iter_plans_archive(request, plan_ids):
+    """Iterate over the tar.gz archive of the templates of plan_ids.
+
+    Templates are downloaded and dumped CONVEYOR_EXPORT_CONCURRENCY at a
+    time and written to the archive as they come, in plan_ids order.
+    Plans that can not be exported are listed in export-errors.txt.
+    """
+    # The archive is written while the response streams, after the view
+    # returned, by threads which must not use the request.
+    return _iter_archive(api.client_credentials(request), list(plan_ids))
+
+
+def _iter_archive(credentials, plan_ids):
+    def export(plan_id):
+        try:
+            plan = api.conveyorclient_for(
+                credentials).plans.download_template(plan_id)
+            return plan_id, yaml.dump(plan[1]['template'],
+                                      Dumper=YAML_DUMPER, encoding='utf-8')
+        except Exception:
+            LOG.exception("Unable to export plan %s.", plan_id)
+            return plan_id, None
+
+    writer = _ArchiveWriter()
+    archive = tarfile.open(mode='w|gz', fileobj=writer)
+    failed = []
+    limit = getattr(settings, 'CONVEYOR_EXPORT_CONCURRENCY', 4)
+    for plan_id, template in utils.bounded_map(export, plan_ids, limit,
+                                               'export'):
+        if template is None:
+            failed.append(plan_id)
+            continue
+        archive.addfile(*_archive_member('plan-%s.yaml' % plan_id,
+                                         template))
+        data = writer.drain()
+        # The compressor keeps small members buffered.
+        if data:
+            yield data
+    if failed:
+        errors = ''.join('Unable to export plan %s.\n' % plan_id
+                         for plan_id in failed)
+        archive.addfile(*_archive_member('export-errors.txt',
+                                         errors.encode('utf-8')))
+    archive.close()
+    yield writer.drain()
@@ -23,6 +23,7 @@ from oslo_log import log as logging
 from conveyordashboard.api import api
 from conveyordashboard.common import constants
 from conveyordashboard.common import utils
+from conveyordashboard.plans import template as plan_template
 
 LOG = logging.getLogger(__name__)
 
@@ -73,11 +74,14 @@ class ImportPlan(forms.SelfHandlingForm):
     def __init__(self, request, *args, **kwargs):
         super(ImportPlan, self).__init__(request, *args, **kwargs)
 
+    def clean_plan_upload(self):
+        upload = self.cleaned_data['plan_upload']
+        self.template = plan_template.load_upload(upload)
+        return upload
+
     def handle(self, request, data):
         try:
-            plan_file = request.FILES['plan_upload']
-            template = plan_file.read()
-            api.create_plan_by_template(request, template)
+            api.create_plan_by_template(request, self.template)
             messages.success(request,
                              _("Successfully imported plan: %s")
                              % data['plan_upload'].name)
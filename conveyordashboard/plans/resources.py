@@ -17,18 +17,26 @@ import json
 import six
 import uuid
 
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware import csrf
 from django.template import loader
+from django.utils import translation
 from oslo_log import log as logging
+from oslo_utils import encodeutils
 from oslo_utils import strutils
 
 from openstack_dashboard import api as os_api
 
 from conveyordashboard.api import api
 from conveyordashboard.common import constants as consts
+from conveyordashboard.common import utils
 from conveyordashboard.security_groups import tables as secgroup_tables
 
 HAS_SERVER = 'HAS_SERVER'
 
+DETAIL_CACHE_PREFIX = 'conveyordashboard:res_detail'
+
 LOG = logging.getLogger(__name__)
 
 
@@ -45,7 +53,57 @@ SHOW_KEY_MAP = {
 }
 
 
+# Resource types whose balloon the browser renders itself, from the Mustache
+# templates of plans/res_detail_client/ and the output of
+# DetailResourceView.properties(). Other types are rendered to HTML.
+CLIENT_TEMPLATES = ('flavor', 'floatingip', 'keypair', 'net', 'port', 'qos',
+                    'routerinterface', 'server', 'subnet', 'volume',
+                    'volumetype')
+
+_client_templates = {}
+
+
+def client_templates():
+    """Return the client templates in the active language and their version.
+
+    Templates only change with the language, they are rendered once per
+    language unless DEBUG is set.
+    """
+    language = translation.get_language()
+    templates = _client_templates.get(language)
+    if templates is None or settings.DEBUG:
+        sources = dict(
+            (node_type, loader.render_to_string(
+                'plans/res_detail_client/%s.html' % node_type).strip())
+            for node_type in CLIENT_TEMPLATES)
+        version = utils.md5(json.dumps(sources,
+                                       sort_keys=True).encode('utf-8'))
+        templates = _client_templates[language] = {'version': version,
+                                                   'templates': sources}
+    return templates
+
+
+def _catalog_ttl():
+    """Time to live of the option lists offered by resource balloons.
+
+    The lists go through the shared resource cache, which keeps key pairs
+    per user and the other types per project and roles, see
+    api.cache_scope.
+    """
+    return getattr(settings, 'CONVEYOR_DETAIL_CATALOG_TTL', 60)
+
+
 class DetailResourceView(object):
+    """Render the edit balloon of a plan resource.
+
+    The resource properties are first normalized for display, then either
+    rendered to HTML or returned as is to be rendered in the browser from
+    the client templates of CLIENT_TEMPLATES.
+
+    Results are cached for CONVEYOR_DETAIL_CACHE_TTL seconds by resource
+    and pending updates. Rendered balloons embed the CSRF token of rules
+    tables, so the cache is per user, project and CSRF token.
+    """
     container = 'plans/res_detail/_balloon_container.html'
 
     def __init__(self, request, plan_id, res_type, res_id,
@@ -64,26 +122,38 @@ class DetailResourceView(object):
             if k in key_map:
                 res[key_map[k]] = v
 
-    def _render_server(self, context):
+    @staticmethod
+    def _options(items, selected, key='id'):
+        """Plain options of a select, marking the item whose key is selected.
+        """
+        return [{'id': getattr(item, 'id', None),
+                 'name': getattr(item, 'name', None),
+                 'selected': getattr(item, key, None) == selected}
+                for item in items]
+
+    def _prepare_server(self, context):
         properties = context['data']
         if 'user_data' not in self.update_data:
             if properties.get('user_data', None):
-                properties['user_data'] = \
+                # Binary user data, e.g. gzipped, is shown mangled rather
+                # than failing the whole balloon.
+                properties['user_data'] = encodeutils.safe_decode(
                     base64.b64decode(properties['user_data']
-                                     .encode('utf-8'))
+                                     .encode('utf-8')),
+                    errors='replace')
         metadata = properties.get('metadata', {})
         if isinstance(metadata, dict):
             properties['metadata'] = '\n'.join(['%s=%s' % (k, v)
                                                 for k, v in metadata.items()])
-        return loader.render_to_string(self.container, context)
 
-    def _render_keypair(self, context):
+    def _prepare_keypair(self, context):
         properties = context['data']
-        keypairs = api.resource_list(self.request, consts.NOVA_KEYPAIR)
-        properties['keypairs'] = keypairs
-        return loader.render_to_string(self.container, context)
+        keypairs = api.resource_list(self.request, consts.NOVA_KEYPAIR,
+                                     ttl=_catalog_ttl())
+        properties['keypairs'] = self._options(
+            keypairs, properties.get('name'), key='name')
 
-    def _render_volume(self, context):
+    def _prepare_volume(self, context):
         properties = context['data']
         metadata = properties.get('metadata', {})
         if isinstance(metadata, dict):
@@ -94,36 +164,32 @@ class DetailResourceView(object):
             properties['copy_data'] = self.res.get('extra_properties',
                                                    {}).get('copy_data', True)
 
-        return loader.render_to_string(self.container, context)
-
-    def _render_volumetype(self, context):
-        vts = api.resource_list(self.request, consts.CINDER_VOL_TYPE)
-        context['data']['volumetypes'] = vts
-        return loader.render_to_string(self.container, context)
+    def _prepare_volumetype(self, context):
+        vts = api.resource_list(self.request, consts.CINDER_VOL_TYPE,
+                                ttl=_catalog_ttl())
+        context['data']['volumetypes'] = self._options(vts, context['id'])
 
-    def _render_qos(self, context):
+    def _prepare_qos(self, context):
         properties = context['data']
         specs = '\n'.join(['%s=%s' % (k, v)
                            for k, v in properties.get('specs', {}).items()])
         properties['specs'] = specs
-        return loader.render_to_string(self.container, context)
 
-    def _render_net(self, context):
+    def _prepare_net(self, context):
         properties = context['data']
 
         if properties.get(HAS_SERVER):
             is_external = properties['router_external']
             tenant_id = self.request.user.tenant_id
-            networks = api.net_list_for_tenant(self.request, tenant_id)
+            networks = api.net_list_for_tenant(self.request, tenant_id,
+                                               ttl=_catalog_ttl())
             networks = [network for network in networks
                         if (getattr(network, 'router:external') == is_external
                             and len(network.subnets) > 0)]
 
-            properties['networks'] = networks
-
-        return loader.render_to_string(self.container, context)
+            properties['networks'] = self._options(networks, context['id'])
 
-    def _render_subnet(self, context):
+    def _prepare_subnet(self, context):
         properties = context['data']
         properties['gateway_ip'] = properties['gateway_ip'] or ''
         if 'no_gateway' not in properties:
@@ -145,38 +211,34 @@ class DetailResourceView(object):
 
         if properties.get(HAS_SERVER):
             search_opts = {'network_id': properties.get('network_id')}
-            subnets = api.subnet_list(self.request, search_opts=search_opts)
-            properties['subnets'] = subnets
-
-        return loader.render_to_string(self.container, context)
+            subnets = api.subnet_list(self.request, search_opts=search_opts,
+                                      ttl=_catalog_ttl())
+            properties['subnets'] = self._options(subnets, context['id'])
 
-    def _render_port(self, context):
+    def _prepare_port(self, context):
         fixed_ips = context['data']['fixed_ips']
 
         # Get detail subnet information for each fixed ip in fixed_ips.
         # And Unite the format for fixed_ips.
+        subnets = api.subnets_get(self.request,
+                                  [ip['subnet_id'] for ip in fixed_ips])
         for fixed_ip in fixed_ips:
-            subnet_id = fixed_ip['subnet_id']
-
-            subnet = api.resource_get(self.request,
-                                      consts.NEUTRON_SUBNET,
-                                      subnet_id)
+            subnet = subnets.get(fixed_ip['subnet_id'])
+            if subnet is None:
+                # The ip is still shown, without a subnet to check it in.
+                LOG.warning("Subnet %s of port %s not found.",
+                            fixed_ip['subnet_id'], self.res_id)
+                fixed_ip['cidr'] = ''
+                fixed_ip['allocation_pools'] = '[]'
+                continue
             fixed_ip['cidr'] = subnet['cidr']
             fixed_ip['allocation_pools'] \
                 = json.dumps(subnet['allocation_pools'])
-        return loader.render_to_string(self.container, context)
 
-    def _render_securitygroup(self, context):
+    def _prepare_securitygroup(self, context):
         properties = context['data']
         rules = properties['security_group_rules']
 
-        def rebuild_rules(r):
-            def_r = {'remote_ip_prefix': None, 'remote_group_id': None,
-                     'ethertype': None, 'security_group_id': None,
-                     'direction': None, 'protocol': None,
-                     'port_range_min': None, 'port_range_max': None}
-            return dict(def_r, **r)
-
         if rules:
             if isinstance(rules, six.string_types):
                 rules = json.JSONDecoder().decode(rules)
@@ -184,27 +246,78 @@ class DetailResourceView(object):
                 for r in rules:
                     if 'id' not in r:
                         r['id'] = str(uuid.uuid4())
-            tmp_rs = [os_api.neutron.SecurityGroupRule(rebuild_rules(r))
-                      for r in rules]
+            properties['security_group_rules'] = rules
             properties['rules'] = json.dumps(rules)
-            rules_table = secgroup_tables.RulesTable(self.request, tmp_rs,
-                                                     secgroup_id=context['id'])
-            context['rules_table'] = rules_table.render()
 
         if properties.get(HAS_SERVER):
             tenant_id = self.request.user.tenant_id
-            secgroups = api.sg_list(self.request, tenant_id)
+            secgroups = api.sg_list(self.request, tenant_id,
+                                    ttl=_catalog_ttl())
             properties['secgroups'] = secgroups
 
+    def _render_securitygroup(self, context):
+        rules = context['data']['security_group_rules']
+
+        def rebuild_rules(r):
+            def_r = {'remote_ip_prefix': None, 'remote_group_id': None,
+                     'ethertype': None, 'security_group_id': None,
+                     'direction': None, 'protocol': None,
+                     'port_range_min': None, 'port_range_max': None}
+            return dict(def_r, **r)
+
+        if rules:
+            tmp_rs = [os_api.neutron.SecurityGroupRule(rebuild_rules(r))
+                      for r in rules]
+            rules_table = secgroup_tables.RulesTable(self.request, tmp_rs,
+                                                     secgroup_id=context['id'])
+            context['rules_table'] = rules_table.render()
         return loader.render_to_string(self.container, context)
 
-    def _render_router(self, context):
+    def _prepare_router(self, context):
         props = context['data']
         props['admin_state_up'] = strutils.bool_from_string(
             props['admin_state_up'])
-        return loader.render_to_string(self.container, context)
+
+    def _cache_key(self, kind):
+        update_data = json.dumps(self.update_data, sort_keys=True,
+                                 default=six.text_type)
+        return ':'.join([DETAIL_CACHE_PREFIX, kind,
+                         str(self.request.user.id),
+                         str(self.request.user.tenant_id),
+                         translation.get_language() or '',
+                         utils.md5(csrf.get_token(self.request).encode(
+                             'utf-8')),
+                         api.resource_cache_generation(self.request),
+                         self.plan_id, self.res_type, self.res_id,
+                         utils.md5(update_data.encode('utf-8'))])
+
+    def _cached(self, kind, build):
+        ttl = getattr(settings, 'CONVEYOR_DETAIL_CACHE_TTL', 60)
+        if not ttl:
+            return build()
+        key = self._cache_key(kind)
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache.set(key, value, ttl)
+        return value
 
     def render(self):
+        """Return the balloon as HTML."""
+        return self._cached('html', self._render)
+
+    def properties(self):
+        """Return the normalized balloon context, for client templates."""
+        return self._cached('json', self._context)
+
+    def _render(self):
+        context = self._context()
+        method = '_render_' + context['type']
+        if hasattr(self, method):
+            return getattr(self, method)(context)
+        return loader.render_to_string(self.container, context)
+
+    def _context(self):
         resource = api.resource_get(self.request, self.res_type, self.res_id)
         self._trans_key(resource)
 
@@ -215,7 +328,7 @@ class DetailResourceView(object):
         resource.update(self.update_data)
 
         node_type = self.res_type.split('::')[-1].lower()
-        method = '_render_' + node_type
+        method = '_prepare_' + node_type
         template_name = ''.join(['plans/res_detail/', node_type, '.html'])
 
         context = {'type': node_type,
@@ -226,6 +339,5 @@ class DetailResourceView(object):
                    'data': resource}
 
         if hasattr(self, method):
-            return getattr(self, method)(context)
-
-        return loader.render_to_string(self.container, context)
+            getattr(self, method)(context)
+        return context
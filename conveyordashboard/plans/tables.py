@@ -13,6 +13,7 @@
 #    under the License.
 
 from django.core.urlresolvers import reverse
+from django import http
 from django.template.defaultfilters import title  # noqa
 from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy
@@ -26,7 +27,9 @@ from oslo_log import log as logging
 
 from conveyordashboard.api import api
 from conveyordashboard.api import models
+from conveyordashboard.api import watch
 from conveyordashboard.common import utils
+from conveyordashboard.plans import export as plan_export
 
 LOG = logging.getLogger(__name__)
 
@@ -36,8 +39,26 @@ NOT_ALLOW_EXPORT_STATUS = ('available', 'cloning', 'migrating', 'finished')
 
 
 class UpdateRow(tables.Row):
+    """Plan row refreshed once its status changed.
+
+    Rows are not polled one by one by horizon: plans_status.js polls the
+    status of all transitional rows in one request and only reloads the
+    rows whose status changed. With CONVEYOR_PLAN_WATCH_EVENTS, status
+    changes are pushed instead.
+    """
     ajax = True
 
+    def load_cells(self, datum=None):
+        super(UpdateRow, self).load_cells(datum)
+        # Rows horizon does not poll are not polled by plans_status.js
+        # either.
+        if 'ajax-update' in self.classes:
+            self.classes[self.classes.index('ajax-update')] = 'batch-update'
+        self.attrs['data-plan-status'] = self.datum.plan_status
+        self.attrs['data-task-status'] = self.datum.task_status or ''
+        if watch.enabled():
+            self.attrs['data-plan-events'] = 'true'
+
     def get_data(self, request, plan_id):
         plan = api.plan_get(request, plan_id)
         return plan
@@ -122,12 +143,37 @@ class ExportPlan(tables.LinkAction):
         return plan.plan_status not in NOT_ALLOW_EXPORT_STATUS
 
 
+class ExportPlans(tables.Action):
+    name = 'export_plans'
+    verbose_name = _("Download Plans")
+    icon = 'download'
+    handles_multiple = True
+    help_text = _("Download the templates of the selected plans as a single "
+                  "tar.gz archive.")
+
+    def multiple(self, data_table, request, object_ids):
+        # Like ExportPlan, leave out the plans which can not be exported.
+        plan_ids = []
+        for plan_id in object_ids:
+            plan = data_table.get_object_by_id(plan_id)
+            if (plan is not None and
+                    plan.plan_status in NOT_ALLOW_EXPORT_STATUS):
+                LOG.info("Plan %s can not be exported while %s.",
+                         plan_id, plan.plan_status)
+                continue
+            plan_ids.append(plan_id)
+        response = http.StreamingHttpResponse(
+            plan_export.iter_plans_archive(request, plan_ids),
+            content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename=plans.tar.gz'
+        return response
+
+
 class PlanFilterAction(tables.FilterAction):
-    def filter(self, table, plans, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [plan for plan in plans
-                if query in getattr(plan, 'name', '').lower()]
+    # Plans are searched across all pages by api.plan_search.
+    filter_type = 'server'
+    filter_choices = (('plan_name', _("Plan Name"), True),
+                      ('plan_status', _("Plan Status ="), True))
 
 
 PLAN_TYPE_CHOICES = (
@@ -200,7 +246,8 @@ class PlansTable(tables.DataTable):
         name = 'plans'
         verbose_name = _("Plans")
         status_columns = ["plan_status", ]
-        table_actions = (ImportPlan, DeletePlan, PlanFilterAction)
+        table_actions = (ImportPlan, ExportPlans, DeletePlan,
+                         PlanFilterAction)
         row_class = UpdateRow
         row_actions = (ClonePlan, MigratePlan,
                        ExportPlan, DeletePlan,)
@@ -0,0 +1,101 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reading and validation of imported plan templates.
+
+Uploads are read by chunks up to CONVEYOR_IMPORT_MAX_SIZE bytes, then
+parsed as JSON or YAML. Templates of at least
+CONVEYOR_IMPORT_PROCESS_THRESHOLD bytes are parsed on the process pool so
+that parsing them does not hold the interpreter lock of the web worker,
+smaller ones are parsed inline.
+"""
+
+from concurrent import futures
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import ugettext_lazy as _
+import yaml
+
+from conveyordashboard.common import utils
+
+# The C parser of libyaml, when PyYAML was built with it.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def check_template(text):
+    """Return why text is not a valid plan template, None if it is.
+
+    May run in a pool process, only the outcome is sent back: a lazily
+    translated message and its params, translated on the request thread.
+    """
+    try:
+        if text.lstrip().startswith('{'):
+            template = json.loads(text)
+        else:
+            template = yaml.load(text, Loader=YAML_LOADER)
+    except ValueError as e:
+        return _("Invalid JSON: %(error)s"), {'error': str(e)}
+    except yaml.YAMLError as e:
+        return _("Invalid YAML: %(error)s"), {'error': str(e)}
+    if not isinstance(template, dict) or not template:
+        return _("The template must be a non empty mapping."), None
+    return None
+
+
+def read_upload(upload):
+    """Return the content of upload, read by chunks up to the size cap."""
+    max_size = getattr(settings, 'CONVEYOR_IMPORT_MAX_SIZE', 32 * 1024 * 1024)
+    too_big = _("The plan file exceeds the maximum size of %s.") \
+        % filesizeformat(max_size)
+    if upload.size > max_size:
+        raise ValidationError(too_big)
+    chunks = []
+    size = 0
+    for chunk in upload.chunks(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise ValidationError(too_big)
+        chunks.append(chunk)
+    try:
+        return b''.join(chunks).decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValidationError(_("The plan file is not UTF-8 encoded."))
+
+
+def load_upload(upload):
+    """Read and validate an uploaded plan template, returning its text."""
+    text = read_upload(upload)
+    threshold = getattr(settings, 'CONVEYOR_IMPORT_PROCESS_THRESHOLD',
+                        1024 * 1024)
+    if len(text) < threshold:
+        error = check_template(text)
+    else:
+        future = utils.get_process_executor().submit(check_template, text)
+        try:
+            error = future.result(
+                getattr(settings, 'CONVEYOR_API_CALL_TIMEOUT', 30))
+        except futures.TimeoutError:
+            # Only drops the task while it is queued, a worker process
+            # already parsing the template goes on until it is done.
+            future.cancel()
+            raise ValidationError(_("Parsing the plan file took too long."))
+    if error:
+        message, params = error
+        raise ValidationError(message, params=params)
+    return text
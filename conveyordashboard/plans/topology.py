@@ -0,0 +1,416 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Server side layout of plan topologies.
+
+Resources are first placed on layers following their dependencies, a
+resource sitting one layer below every resource depending on it. When
+NumPy is available and the topology is small enough, the layered layout
+is then refined by a vectorized force simulation. Layouts are cached by
+topology content, so the browser only has to draw the nodes.
+
+Big topologies can be collapsed into clusters grouping resources by type,
+availability zone or owning server, expanded one at a time on demand.
+
+Browsers may ask for topologies in a compact columnar encoding, see
+compact_topology.
+"""
+
+import collections
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from oslo_log import log as logging
+
+from conveyordashboard.common import constants as consts
+from conveyordashboard.common import utils
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOG = logging.getLogger(__name__)
+
+LAYOUT_CACHE_PREFIX = 'conveyordashboard:topo_layout'
+
+# Distance between two neighbour nodes, the link distance of the browser
+# force layout.
+NODE_SPACING = 90.0
+
+FORCE_ITERATIONS = 50
+
+# Pull towards the center keeping unlinked nodes from drifting away, like
+# the gravity of the browser force layout.
+FORCE_GRAVITY = 0.05
+
+# Rows of the repulsion matrix computed at once, bounds memory use to
+# FORCE_CHUNK_SIZE x nodes x 2 floats.
+FORCE_CHUNK_SIZE = 512
+
+CLUSTER_MODES = ('type', 'availability_zone', 'server')
+
+CLUSTER_ID_PREFIX = 'cluster'
+
+COMPACT_FORMAT = 'compact'
+
+# Node fields of the cluster nodes kept by the compact encoding.
+COMPACT_CLUSTER_FIELDS = ('cluster', 'count', 'types')
+
+
+def _build_graph(topo):
+    ids = []
+    index = {}
+    for node in topo:
+        if node['id'] not in index:
+            index[node['id']] = len(ids)
+            ids.append(node['id'])
+
+    edges = set()
+    for node in topo:
+        source = index[node['id']]
+        for dep in node.get('dependencies') or []:
+            target = index.get(dep['id'])
+            if target is not None and target != source:
+                edges.add((source, target))
+    return ids, sorted(edges)
+
+
+def _layers(count, edges):
+    """Longest path layering of the dependency graph.
+
+    Nodes on dependency cycles keep the deepest layer reached from
+    outside of the cycle.
+    """
+    children = [[] for _i in range(count)]
+    indegree = [0] * count
+    for source, target in edges:
+        children[source].append(target)
+        indegree[target] += 1
+
+    layer = [0] * count
+    queue = collections.deque(i for i in range(count) if not indegree[i])
+    while queue:
+        i = queue.popleft()
+        for child in children[i]:
+            layer[child] = max(layer[child], layer[i] + 1)
+            indegree[child] -= 1
+            if not indegree[child]:
+                queue.append(child)
+    return layer
+
+
+def _layered_positions(count, edges):
+    layer = _layers(count, edges)
+    parents = [[] for _i in range(count)]
+    for source, target in edges:
+        parents[target].append(source)
+
+    by_layer = collections.defaultdict(list)
+    for i in range(count):
+        by_layer[layer[i]].append(i)
+
+    # Wide layers, e.g. thousands of ports, are wrapped on several rows.
+    row_size = max(8, int(math.ceil(math.sqrt(count))) * 2)
+    x = [0.0] * count
+    y = [0.0] * count
+    row = 0
+    for level in sorted(by_layer):
+        nodes = by_layer[level]
+        # Order nodes by the mean position of their parents to limit
+        # crossing links.
+        nodes.sort(key=lambda i: (sum(x[p] for p in parents[i]) /
+                                  len(parents[i])) if parents[i] else 0.0)
+        for start in range(0, len(nodes), row_size):
+            chunk = nodes[start:start + row_size]
+            offset = (row_size - len(chunk)) / 2.0
+            for pos, i in enumerate(chunk):
+                x[i] = (offset + pos) * NODE_SPACING
+                y[i] = row * NODE_SPACING
+            row += 1
+    return x, y
+
+
+def _force_refine(x, y, edges):
+    """Refine positions with a Fruchterman-Reingold simulation."""
+    pos = np.array([x, y], dtype=np.float64).T
+    count = len(pos)
+    k = NODE_SPACING
+    if edges:
+        sources = np.array([e[0] for e in edges])
+        targets = np.array([e[1] for e in edges])
+    temperature = NODE_SPACING
+    cooling = temperature / (FORCE_ITERATIONS + 1)
+
+    for _i in range(FORCE_ITERATIONS):
+        disp = np.zeros_like(pos)
+        for start in range(0, count, FORCE_CHUNK_SIZE):
+            delta = pos[start:start + FORCE_CHUNK_SIZE, None, :] - pos[None]
+            dist2 = (delta ** 2).sum(axis=-1) + 0.01
+            disp[start:start + FORCE_CHUNK_SIZE] += \
+                (delta * (k * k / dist2)[..., None]).sum(axis=1)
+        if edges:
+            delta = pos[sources] - pos[targets]
+            dist = np.sqrt((delta ** 2).sum(axis=-1)) + 0.01
+            pull = delta * (dist / k)[:, None]
+            np.add.at(disp, sources, -pull)
+            np.add.at(disp, targets, pull)
+        disp -= (pos - pos.mean(axis=0)) * FORCE_GRAVITY
+
+        length = np.sqrt((disp ** 2).sum(axis=-1)) + 0.01
+        step = np.minimum(length, temperature) / length
+        pos += disp * step[:, None]
+        temperature -= cooling
+
+    return pos[:, 0].tolist(), pos[:, 1].tolist()
+
+
+def compute_layout(topo):
+    """Compute node coordinates for a plan topology.
+
+    Returns {'width': w, 'height': h, 'positions': {id: [x, y]}} with
+    coordinates in [0, w] x [0, h].
+    """
+    ids, edges = _build_graph(topo)
+    if not ids:
+        return {'width': 0, 'height': 0, 'positions': {}}
+
+    x, y = _layered_positions(len(ids), edges)
+    max_nodes = getattr(settings, 'CONVEYOR_TOPO_LAYOUT_FORCE_MAX_NODES',
+                        1000)
+    if np is not None and len(ids) <= max_nodes:
+        x, y = _force_refine(x, y, edges)
+
+    margin = NODE_SPACING / 2
+    min_x, min_y = min(x), min(y)
+    positions = dict((node_id, [round(x[i] - min_x + margin, 1),
+                                round(y[i] - min_y + margin, 1)])
+                     for i, node_id in enumerate(ids))
+    return {'width': round(max(x) - min_x + 2 * margin, 1),
+            'height': round(max(y) - min_y + 2 * margin, 1),
+            'positions': positions}
+
+
+def get_layout(topo):
+    """Return the layout of topo, computed once per topology content."""
+    digest = utils.md5(json.dumps(topo, sort_keys=True).encode('utf-8'))
+    key = ':'.join([LAYOUT_CACHE_PREFIX, digest])
+    layout = cache.get(key)
+    if layout is None:
+        layout = compute_layout(topo)
+        ttl = getattr(settings, 'CONVEYOR_TOPO_CACHE_TTL', 600)
+        if ttl:
+            cache.set(key, layout, ttl)
+    return layout
+
+
+def _availability_zone(node):
+    return (node.get('availability_zone') or
+            (node.get('properties') or {}).get('availability_zone'))
+
+
+def _server_owners(topo):
+    """Map resources to the single server depending on them, if any.
+
+    A server owns itself and the resources only reachable through its own
+    dependencies, e.g. its ports and volumes. Resources shared by several
+    servers, like networks or security groups, have no owner.
+
+    Owners are spread from all servers at once along the dependencies. A
+    resource goes from no owner, to a server, to shared by several, and is
+    only visited again when that changes, so at most three times.
+    """
+    children = dict((node['id'], [dep['id'] for dep
+                                  in node.get('dependencies') or []])
+                    for node in topo)
+    shared = object()
+    owners = {}
+    queue = collections.deque()
+    for node in topo:
+        if node['type'] == consts.NOVA_SERVER:
+            owners[node['id']] = node['id']
+            queue.append(node['id'])
+    while queue:
+        res_id = queue.popleft()
+        owner = owners[res_id]
+        for child in children.get(res_id, ()):
+            current = owners.get(child)
+            if current is shared or current == owner:
+                continue
+            owners[child] = owner if current is None else shared
+            queue.append(child)
+    return dict((res_id, owner) for res_id, owner in owners.items()
+                if owner is not shared)
+
+
+def _cluster_keys(topo, mode):
+    if mode == 'type':
+        return dict((node['id'], node['type']) for node in topo)
+    if mode == 'availability_zone':
+        return dict((node['id'], _availability_zone(node)) for node in topo)
+    return _server_owners(topo)
+
+
+def _cluster_node(cluster_id, mode, key, members):
+    types = collections.Counter(node['type'] for node in members)
+    if mode == 'server':
+        # A server owns itself, fall back on its id all the same.
+        server = next((n for n in members if n['id'] == key), None)
+        label = (server or {}).get('name_in_template') or key
+    else:
+        label = key
+    return {'id': cluster_id,
+            'name': cluster_id,
+            'name_in_template': '%s (%d)' % (label, len(members)),
+            'type': types.most_common(1)[0][0],
+            'cluster': mode,
+            'count': len(members),
+            'types': dict(types),
+            'is_cloned': all(n.get('is_cloned') for n in members),
+            'dependencies': []}
+
+
+def cluster_topology(topo, mode, expanded=(), min_size=None):
+    """Collapse topo into clusters of resources sharing a mode key.
+
+    Groups of at least min_size resources, unless listed by cluster id in
+    expanded, are replaced by a single node counting its members. In
+    'server' mode every server owning other resources is collapsed.
+    Dependencies from or to members become dependencies of the cluster.
+    Returns the visible topology, its size only depends on the number of
+    clusters and expanded resources.
+    """
+    if mode not in CLUSTER_MODES:
+        raise ValueError('Unknown cluster mode %s' % mode)
+    if mode == 'server':
+        min_size = 2
+    elif min_size is None:
+        min_size = getattr(settings, 'CONVEYOR_TOPO_CLUSTER_MIN_SIZE', 5)
+    expanded = set(expanded)
+
+    keys = _cluster_keys(topo, mode)
+    groups = collections.defaultdict(list)
+    for node in topo:
+        key = keys.get(node['id'])
+        if key is not None:
+            groups[key].append(node)
+
+    visible_id = dict((node['id'], node['id']) for node in topo)
+    clusters = {}
+    for key, members in groups.items():
+        cluster_id = ':'.join([CLUSTER_ID_PREFIX, mode, key])
+        if len(members) < min_size or cluster_id in expanded:
+            continue
+        clusters[cluster_id] = _cluster_node(cluster_id, mode, key, members)
+        for node in members:
+            visible_id[node['id']] = cluster_id
+
+    result = collections.OrderedDict()
+    for node in topo:
+        node_id = visible_id[node['id']]
+        if node_id not in result:
+            result[node_id] = clusters.get(node_id) or dict(node)
+            result[node_id]['dependencies'] = []
+
+    links = collections.OrderedDict()
+    for node in topo:
+        source = visible_id[node['id']]
+        for dep in node.get('dependencies') or []:
+            target = visible_id.get(dep['id'], dep['id'])
+            if target == source:
+                continue
+            cloned = bool(dep.get('is_cloned'))
+            if (source, target) in links:
+                links[(source, target)]['is_cloned'] &= cloned
+                continue
+            if target in clusters:
+                dep = dict((k, clusters[target][k])
+                           for k in ('type', 'name_in_template', 'cluster'))
+            links[(source, target)] = dict(dep, id=target, is_cloned=cloned)
+            result[source]['dependencies'].append(links[(source, target)])
+    return list(result.values())
+
+
+def _interned(table, index, value):
+    if value not in index:
+        index[value] = len(table)
+        table.append(value)
+    return index[value]
+
+
+def compact_topology(topo, layout=None):
+    """Encode topo, and its layout if given, in the compact format.
+
+    Resource types and ids are interned in the types and ids tables. Node
+    fields are columns following the order of ids, the dependencies of the
+    i-th node are deps[offsets[i]:offsets[i + 1]], as indexes in ids with
+    their is_cloned flag in dep_cloned. Resources only depended on follow
+    the nodes in ids, only their type and name_in_template are kept.
+
+    Only the fields drawn by the browser are encoded. The others, e.g.
+    properties, are fetched on demand from the topo_nodes endpoint. Nodes
+    repeating an id are left out.
+    """
+    types, type_index = [], {}
+    ids, id_index = [], {}
+    nodes = []
+    for node in topo:
+        if node['id'] not in id_index:
+            _interned(ids, id_index, node['id'])
+            nodes.append(node)
+    count = len(nodes)
+
+    type_col = [_interned(types, type_index, n['type']) for n in nodes]
+    name_col = [n.get('name') for n in nodes]
+    label_col = [n.get('name_in_template') for n in nodes]
+    cloned_col = [None if n.get('is_cloned') is None else int(n['is_cloned'])
+                  for n in nodes]
+    offsets = [0]
+    deps = []
+    dep_cloned = []
+    for node in nodes:
+        for dep in node.get('dependencies') or []:
+            if dep['id'] not in id_index:
+                _interned(ids, id_index, dep['id'])
+                type_col.append(_interned(types, type_index, dep['type']))
+                label_col.append(dep.get('name_in_template'))
+            deps.append(id_index[dep['id']])
+            dep_cloned.append(int(bool(dep.get('is_cloned'))))
+        offsets.append(len(deps))
+
+    result = {'format': COMPACT_FORMAT,
+              'count': count,
+              'types': types,
+              'ids': ids,
+              'type': type_col,
+              'name': [None if name == ids[i] else name
+                       for i, name in enumerate(name_col)],
+              'name_in_template': label_col,
+              'is_cloned': cloned_col,
+              'offsets': offsets,
+              'deps': deps,
+              'dep_cloned': dep_cloned,
+              'clusters': dict(
+                  (i, dict((k, n[k]) for k in COMPACT_CLUSTER_FIELDS))
+                  for i, n in enumerate(nodes) if n.get('cluster'))}
+    if layout is not None:
+        positions = [layout['positions'].get(node_id)
+                     for node_id in ids[:count]]
+        result['layout'] = {'width': layout['width'],
+                            'height': layout['height'],
+                            'x': [p and p[0] for p in positions],
+                            'y': [p and p[1] for p in positions]}
+    return result
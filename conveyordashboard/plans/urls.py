@@ -24,6 +24,8 @@ urlpatterns = patterns(
     url(r'^$', views.IndexView.as_view(), name='index'),
     url(r'^create$', views.CreateView.as_view(), name='create'),
     url(PLAN % 'clone', views.CloneView.as_view(), name='clone'),
+    url(PLAN % 'deps_table', views.DepsTableView.as_view(),
+        name='deps_table'),
     # url(r'^migrate$', views.MigrateView.as_view(), name='migrate'),
     url(r'^import$', views.ImportView.as_view(), name='import'),
     url(PLAN % '', views.DetailView.as_view(), name='detail'),
@@ -13,7 +13,6 @@
 #    under the License.
 
 import json
-import yaml
 
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
@@ -34,6 +33,7 @@ from conveyordashboard.api import api
 from conveyordashboard.api import models
 from conveyordashboard.common import constants
 from conveyordashboard.common import tables as common_tables
+from conveyordashboard.plans import export as plan_export
 from conveyordashboard.plans import forms as plan_forms
 from conveyordashboard.plans import tables as plan_tables
 from conveyordashboard.plans import tabs as plan_tabs
@@ -53,14 +53,20 @@ class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
 
         try:
             marker, sort_dir = self._get_marker()
-            search_opts = {
-                'marker': marker,
-                'sort_dir': sort_dir,
-                'paginate': True
-            }
-
-            plans, self._has_more_data, self._has_prev_data = \
-                api.plan_list(self.request, search_opts=search_opts)
+            filters = self.get_filters({})
+            if filters:
+                field, query = filters.popitem()
+                plans, self._has_more_data, self._has_prev_data = \
+                    api.plan_search(self.request, field, query,
+                                    marker=marker, sort_dir=sort_dir)
+            else:
+                search_opts = {
+                    'marker': marker,
+                    'sort_dir': sort_dir,
+                    'paginate': True
+                }
+                plans, self._has_more_data, self._has_prev_data = \
+                    api.plan_list(self.request, search_opts=search_opts)
 
             if sort_dir == "asc":
                 plans.reverse()
@@ -228,6 +234,27 @@ class CloneView(workflows.WorkflowView):
         }
 
 
+class DepsTableView(View):
+    """Dependencies table of the clone workflow, loaded with the topology."""
+    @staticmethod
+    def get(request, **kwargs):
+        plan_id = kwargs['plan_id']
+        try:
+            az_map = json.loads(
+                request.GET.get('availability_zone_map') or '{}')
+            topo = api.build_resources_topo(request, plan_id, az_map)
+        except Exception:
+            exceptions.handle(request,
+                              _("Unable to retrieve plan dependencies."),
+                              ignore=True)
+            return http.HttpResponseServerError()
+        table = plan_tables.PlanDepsTable(request,
+                                          plan_tables.trans_plan_deps(topo),
+                                          plan_id=plan_id,
+                                          plan_type=constants.CLONE)
+        return http.HttpResponse(table.render())
+
+
 class ImportView(forms.ModalFormView):
     form_class = plan_forms.ImportPlan
     form_id = 'import_plan_form'
@@ -261,10 +288,14 @@ class ExportView(View):
                               redirect=redirect)
             return
 
-        response = http.HttpResponse(content_type='application/binary')
+        chunks = plan_export.iter_yaml(plan[1]['template'])
+        response = http.StreamingHttpResponse(
+            content_type='application/binary')
+        if plan_export.accepts_gzip(request):
+            chunks = plan_export.iter_gzip(chunks)
+            response['Content-Encoding'] = 'gzip'
+        response.streaming_content = chunks
+        response['Vary'] = 'Accept-Encoding'
         response['Content-Disposition'] = ('attachment; filename=plan-%s'
                                            % plan_id)
-        template = yaml.dump(yaml.load(json.dumps(plan[1]['template'])))
-        response.write(template)
-        response['Content-Length'] = str(len(response.content))
         return response
@@ -18,23 +18,32 @@ from horizon import forms
 from horizon import tables
 
 from conveyordashboard.api import api
+from conveyordashboard.common import tables as common_tables
 from conveyordashboard.security_groups import forms as secgroup_forms
 from conveyordashboard.security_groups import tables as secgroup_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = secgroup_tables.SecurityGroupsTable
     template_name = '_res_table.html'
     page_title = _("Security Groups")
 
     def get_data(self):
         try:
-            secgroups = api.sg_list(self.request, self.request.user.tenant_id)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            secgroups, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.sg_list, search_opts,
+                              tenant_id=self.request.user.tenant_id)
+            if sort_dir == "asc":
+                secgroups.reverse()
         except Exception:
             secgroups = []
             exceptions.handle(self.request,
                               _('Unable to retrieve security groups.'))
-        return sorted(secgroups, key=lambda group: group.name)
+        # Rows keep the listing order the page markers refer to.
+        return secgroups
 
 
 class AddRuleView(forms.ModalFormView):
@@ -19,10 +19,11 @@ from horizon import tables
 from horizon.utils import memoized
 
 from conveyordashboard.api import api
+from conveyordashboard.common import tables as common_tables
 from conveyordashboard.stacks import tables as stacks_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = stacks_tables.StacksTable
     template_name = '_res_table.html'
     page_title = _("Stacks")
@@ -31,7 +32,13 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         stacks = []
         try:
-            stacks = api.stack_list(self.request)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            stacks, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.stack_list, search_opts)
+            if sort_dir == "asc":
+                stacks.reverse()
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve stacks."))
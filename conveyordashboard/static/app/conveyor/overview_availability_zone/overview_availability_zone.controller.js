@@ -21,6 +21,7 @@
 
   OverviewAzController.$inject = [
     '$q',
+    '$scope',
     '$location',
     'horizon.app.core.openstack-service-api.conveyor',
     'horizon.app.conveyor.resourceTypes',
@@ -29,7 +30,7 @@
     'horizon.framework.widgets.modal.simple-modal.service'
   ];
 
-  function OverviewAzController($q, $location, conveyor, resourceTypes, planTypes, userSession, simpleModalService) {
+  function OverviewAzController($q, $scope, $location, conveyor, resourceTypes, planTypes, userSession, simpleModalService) {
     var ctrl = this;
     ctrl.enableBuildTopo = true;
     ctrl.enableClone = false;
@@ -45,9 +46,21 @@
     ctrl.incrementalClone = true;
     ctrl.sysClone = false;
     ctrl.copyData = true;
+    ctrl.clusterModes = [
+      {mode: 'type', label: gettext('Group by resource type')},
+      {mode: 'availability_zone', label: gettext('Group by availability zone')},
+      {mode: 'server', label: gettext('Group by server')}
+    ];
+    ctrl.clusterMode = 'type';
+    ctrl.expanded = [];
+    ctrl.clustered = false;
 
     ctrl.buildTopology = buildTopology;
     ctrl.prepareTopology = prepareTopology;
+    ctrl.changeClusterMode = changeClusterMode;
+    ctrl.watchPlanStatus = watchPlanStatus;
+    ctrl.planEvents = null;
+    ctrl.expandCluster = expandCluster;
     ctrl.setEnableExecutePlan = setEnableExecutePlan;
     ctrl.clone = clone;
     
@@ -55,6 +68,7 @@
       if(!ctrl.dest_az || ctrl.dest_az === "") {
         return;
       }
+      ctrl.expanded = [];
 
       ctrl.enableBuildTopo = false;
       ctrl.enableClone = false;
@@ -92,24 +106,92 @@
       var azMap = {};
       azMap[ctrl.src_az] = ctrl.dest_az;
       ctrl.azMap = $.extend({}, azMap);
-      conveyor.buildResourcesTopo(planId, azMap).then(function (data) {
-        var topology = data.data.topo;
-        conveyorPlan.initPlan(planId, topology);
-        conveyorPlanTopology.loadingFromJson(topology);
-        // Set click event for clone plan.
-        if (ctrl.plan.plan_type == planTypes.CLONE) {
-          $('g.node[cloned=false]').click(function () {
-            conveyorEditPlanRes.nodeClick(this);
-          })
+      conveyor.buildClusteredTopo(planId, azMap, ctrl.clusterMode, ctrl.expanded).then(function (data) {
+        var decoded = conveyorPlanTopology.decodeTopo(data.data);
+        var topology = decoded.topo;
+        ctrl.clustered = data.data.clustered;
+        conveyorPlanTopology.setNodeSource(planId, angular.toJson(azMap));
+        conveyorPlanTopology.loadingFromJson(topology, decoded.layout);
+        if (ctrl.clustered) {
+          // The plan model needs every resource, it is only loaded from the
+          // full topology when cloning. Clusters expand on click.
+          $('g.node[cluster]').click(function () {
+            var clusterId = $(this).attr('node_id');
+            $scope.$apply(function () {
+              ctrl.expandCluster(clusterId);
+            });
+          });
+        } else {
+          conveyorPlan.initPlan(planId, topology);
+          // Set click event for clone plan.
+          if (ctrl.plan.plan_type == planTypes.CLONE) {
+            $('g.node[cloned=false]').click(function () {
+              conveyorEditPlanRes.nodeClick(this);
+            })
+          }
         }
         ctrl.enableBuildTopo = true;
         ctrl.setEnableExecutePlan();
+        ctrl.watchPlanStatus();
       }, function () {
         ctrl.enableBuildTopo = true;
         ctrl.enableClone = false;
       })
     }
 
+    function changeClusterMode() {
+      ctrl.expanded = [];
+      if (ctrl.plan && ctrl.clustered) {
+        ctrl.prepareTopology();
+      }
+    }
+
+    function expandCluster(clusterId) {
+      if ($.inArray(clusterId, ctrl.expanded) < 0) {
+        ctrl.expanded.push(clusterId);
+        ctrl.prepareTopology();
+      }
+    }
+
+    function loadPlan() {
+      var planId = ctrl.plan.plan_id;
+      if (!ctrl.clustered) {
+        return $q.when(conveyorPlan.getPlan(planId));
+      }
+      return conveyor.buildResourcesTopo(planId, ctrl.azMap).then(function (data) {
+        conveyorPlan.initPlan(planId, conveyorPlanTopology.decodeTopo(data.data).topo);
+      });
+    }
+
+    /*
+     * Follow the status of the plan through the server-sent plan events, so
+     * that cloning is enabled once the plan becomes available.
+     */
+    function watchPlanStatus() {
+      if (ctrl.planEvents || !window.EventSource) {
+        return;
+      }
+      ctrl.planEvents = new EventSource(WEBROOT + 'api/conveyor/plans/events/');
+      var onStatuses = function (e) {
+        var items = JSON.parse(e.data);
+        angular.forEach(angular.isArray(items) ? items : [items], function (item) {
+          if (ctrl.plan && item.plan_id == ctrl.plan.plan_id &&
+              item.plan_status != ctrl.plan.plan_status) {
+            $scope.$apply(function () {
+              ctrl.plan.plan_status = item.plan_status;
+              ctrl.plan.task_status = item.task_status;
+              ctrl.setEnableExecutePlan();
+            });
+          }
+        });
+      };
+      ctrl.planEvents.addEventListener('snapshot', onStatuses);
+      ctrl.planEvents.addEventListener('status', onStatuses);
+      $scope.$on('$destroy', function () {
+        ctrl.planEvents.close();
+      });
+    }
+
     function setEnableExecutePlan() {
       if (!ctrl.plan) {
         ctrl.enableClone = false;
@@ -118,9 +200,8 @@
 
       var planType = ctrl.plan.plan_type;
       var planStatus = ctrl.plan.plan_status;
-      if (planType == planTypes.CLONE && $.inArray(planStatus, ['available', 'finished']) > -1) {
-        ctrl.enableClone = true;
-      }
+      ctrl.enableClone = planType == planTypes.CLONE &&
+        $.inArray(planStatus, ['available', 'finished']) > -1;
       return false;
     }
 
@@ -134,7 +215,7 @@
         cancel: gettext('No')
       };
 
-      simpleModalService.modal(options).result.then(function confirmed() {
+      simpleModalService.modal(options).result.then(loadPlan).then(function confirmed() {
         var planId = ctrl.plan.plan_id;
         var cloneResourceInfo = conveyorPlan.extractCloneInfo(planId, ctrl.incrementalClone);
 
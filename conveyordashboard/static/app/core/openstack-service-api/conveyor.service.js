@@ -39,6 +39,7 @@
       createPlan: createPlan,
       getResources: getResources,
       buildResourcesTopo: buildResourcesTopo,
+      buildClusteredTopo: buildClusteredTopo,
       clone: clone,
     };
 
@@ -69,12 +70,27 @@
         })
     }
     function buildResourcesTopo(planId, availabilityZoneMap) {
-      var params = {'params': {'availability_zone_map': availabilityZoneMap}};
+      var params = {'params': {
+        'availability_zone_map': availabilityZoneMap,
+        'format': 'compact'
+      }};
       return apiService.get('/api/conveyor/plans/' + planId + '/build_resources_topo/', params)
         .error(function () {
           toastService.add('error', gettext('Unable to build resources topology.'))
         })
     }
+    function buildClusteredTopo(planId, availabilityZoneMap, mode, expanded) {
+      var params = {'params': {
+        'availability_zone_map': availabilityZoneMap,
+        'mode': mode,
+        'expanded': JSON.stringify(expanded || []),
+        'format': 'compact'
+      }};
+      return apiService.get('/api/conveyor/plans/' + planId + '/clustered_topo/', params)
+        .error(function () {
+          toastService.add('error', gettext('Unable to build resources topology.'))
+        })
+    }
     function clone(planId, availabilityZoneMap, cloneResources, cloneLinks, updateResources, replaceResources, sysClone, copyData) {
       var params = {
         plan_id: planId,
@@ -660,7 +660,7 @@ var conveyorPlan = {
     }
     this.replaceResourceSelf(plan.updated_deps, resType, srcId, desId)
   },
-  changePortFromSubnet: function (plan, portRes, srcSubnetId, newSubnet) {
+  changePortFromSubnet: function (plan, portRes, srcSubnetId, newSubnet, details) {
     var resType = 'OS::Neutron::Port';
 
     // Update port self
@@ -674,8 +674,11 @@ var conveyorPlan = {
 
     var portUpdateResource = this.getUpdateResource(plan.plan_id, resType, portRes.id);
     var fixedIps;
+    var portDetail = (details || {})[conveyorService.resourceKey(resType, portRes.id)];
     if (portUpdateResource && portUpdateResource.fixed_ips) {
       fixedIps = portUpdateResource.fixed_ips;
+    } else if (portDetail) {
+      fixedIps = portDetail.fixed_ips;
     } else {
       fixedIps = conveyorService.getResource(resType, portRes.id).fixed_ips;
     }
@@ -699,10 +702,9 @@ var conveyorPlan = {
       }
     }
   },
-  changeSubnetFromNet: function (plan, subnetRes, srcNetId, desNetId) {
+  changeSubnetFromNet: function (plan, subnetRes, srcNetId, desNetId, subnets, details) {
     var resType = 'OS::Neutron::Subnet';
-    var subnets = conveyorService.getResources(resType, {'network_id': desNetId});
-    if(!subnets) {
+    if(!subnets || !subnets.length) {
       return;
     }
 
@@ -728,7 +730,7 @@ var conveyorPlan = {
     // Update dependent items(OS::Neutron::Port).
     var depResList = this.getDependentResources(plan.updated_deps, resType, subnetRes.id);
     for(var idx in depResList) {
-      this.changePortFromSubnet(plan, depResList[idx], subnetRes.id, newSubnet);
+      this.changePortFromSubnet(plan, depResList[idx], subnetRes.id, newSubnet, details);
     }
 
     // Update subnet self
@@ -746,21 +748,23 @@ var conveyorPlan = {
       }
     }
   },
-  changeSubnet: function (plan, srcId, desId) {
+  changeSubnet: function (plan, srcId, desId, details) {
     var resType = 'OS::Neutron::Subnet';
+    var newSubnet = details[conveyorService.resourceKey(resType, desId)]
+      || conveyorService.getResource(resType, desId);
     // 1. Update replace_resources.
     this.replaceResource(plan, resType, srcId, desId);
 
     // 2. Update dependent items.
     var depResList = this.getDependentResources(plan.updated_deps, resType, srcId);
     for(var idx in depResList) {
-      this.changePortFromSubnet(plan, depResList[idx], srcId, conveyorService.getResource(resType, desId));
+      this.changePortFromSubnet(plan, depResList[idx], srcId, newSubnet, details);
     }
 
     // 3. Update subnet self.
     this.replaceResourceSelf(plan.updated_deps, resType, srcId, desId);
   },
-  changeNet: function (plan, srcId, desId) {
+  changeNet: function (plan, srcId, desId, subnets, details) {
     var resType = 'OS::Neutron::Net';
     // 1. Update replace_resources.
     this.replaceResource(plan, resType, srcId, desId);
@@ -772,7 +776,7 @@ var conveyorPlan = {
     for (var idx in depResList) {
       depRes = depResList[idx];
       if (depRes.type == 'OS::Neutron::Subnet') {
-        this.changeSubnetFromNet(plan, depRes, srcId, desId)
+        this.changeSubnetFromNet(plan, depRes, srcId, desId, subnets, details);
       } else if (depRes.type == 'OS::Neutron::Port') {
         this.changePortFromNet(plan, depRes, srcId, desId);
       }
@@ -782,25 +786,65 @@ var conveyorPlan = {
     this.replaceResourceSelf(plan.updated_deps, resType, srcId, desId);
   },
   /*
-  * Update the one of resources of plan with some simple fields, or replace with another resource.*/
-  updatePlanResource: function (planId, resType, resId, data) {
-    if(data.needPosted) {
-      var desId = data.data.id;
-      var plan = this.getPlan(planId);
-      if (!plan) {
-        return;
+  * List the ports depending on a subnet whose fixed ips are not known yet.*/
+  portsToFetch: function (plan, subnetId) {
+    var self = this;
+    var resType = 'OS::Neutron::Port';
+    var ports = [];
+    $.each(this.getDependentResources(plan.updated_deps, 'OS::Neutron::Subnet', subnetId), function (idx, depRes) {
+      var updateResource = self.getUpdateResource(plan.plan_id, resType, depRes.id);
+      if (!(updateResource && updateResource.fixed_ips)) {
+        ports.push({type: resType, id: depRes.id});
       }
+    });
+    return ports;
+  },
+  /*
+  * Update the one of resources of plan with some simple fields, or replace with another resource.
+  * Resource details needed for replacing are fetched with one batch request, the returned promise
+  * is resolved once the plan is updated.*/
+  updatePlanResource: function (planId, resType, resId, data) {
+    var self = this;
+    var done = $.Deferred().resolve().promise();
+    if(!data.needPosted) {
+      this.updateUpdateResource(planId, resType, resId, data.data);
+      return done;
+    }
 
-      if ($.inArray(resType, ['OS::Nova::KeyPair', 'OS::Cinder::VolumeType', 'OS::Neutron::SecurityGroup']) > -1) {
-        this.changeCommonResource(plan, resType, resId, desId)
-      }
-      else if (resType == 'OS::Neutron::Net') {
-        this.changeNet(plan, resId, desId)
-      } else if (resType == 'OS::Neutron::Subnet') {
-        this.changeSubnet(plan, resId, desId)
-      }
+    var desId = data.data.id;
+    var plan = this.getPlan(planId);
+    if (!plan) {
+      return done;
+    }
+
+    if ($.inArray(resType, ['OS::Nova::KeyPair', 'OS::Cinder::VolumeType', 'OS::Neutron::SecurityGroup']) > -1) {
+      this.changeCommonResource(plan, resType, resId, desId);
+      return done;
+    }
+
+    var wanted = [];
+    // Subnets of the new network, listed only when subnets depend on the network.
+    var subnets = null;
+    if (resType == 'OS::Neutron::Net') {
+      $.each(this.getDependentResources(plan.updated_deps, resType, resId), function (idx, depRes) {
+        if (depRes.type == 'OS::Neutron::Subnet') {
+          wanted = wanted.concat(self.portsToFetch(plan, depRes.id));
+          subnets = subnets || conveyorService.getResources(depRes.type, {'network_id': desId});
+        }
+      });
+    } else if (resType == 'OS::Neutron::Subnet') {
+      wanted = this.portsToFetch(plan, resId);
+      wanted.push({type: resType, id: desId});
     } else {
-      this.updateUpdateResource(planId, resType, resId, data.data);
+      return done;
     }
+
+    return $.when(conveyorService.getResourcesDetail(wanted), subnets).then(function (details, subnets) {
+      if (resType == 'OS::Neutron::Net') {
+        self.changeNet(plan, resId, desId, subnets, details);
+      } else {
+        self.changeSubnet(plan, resId, desId, details);
+      }
+    });
   }
 };
@@ -43,6 +43,35 @@ var conveyorService = {
     return result;
   },
 
+  /*
+  * Like syncAjax, without blocking the page: the returned promise is
+  * resolved with the result, or with false when the request failed.*/
+  asyncAjax: function (url, method, data, errorMsg) {
+    var deferred = $.Deferred();
+    $.ajax({
+      url: url,
+      type: method,
+      data: data,
+      async: true,
+      beforeSend: function (xhr, settings) {
+        xhr.setRequestHeader("X-CSRFToken", $.cookie('csrftoken'));
+      },
+      success: function (data) {
+        deferred.resolve(data);
+      },
+      error: function (xhr) {
+        console.log(xhr);
+        if (xhr.status == 401) {
+          window.location.href = WEBROOT + 'auth/login/?next=' + window.location.href;
+        } else {
+          horizon.alert('error', errorMsg);
+          deferred.resolve(false);
+        }
+      }
+    });
+    return deferred.promise();
+  },
+
   formatParams: function (params) {
     var result = '';
     $.each(params, function (k, v) {
@@ -56,59 +85,137 @@ var conveyorService = {
   },
 
   getResource: function (resType, resId) {
-    var result = null;
-    var url = WEBROOT + 'api/conveyor/resources/' + resType + '/' + resId + '/';
-    $.ajaxSetup({async: false});
-    $.get(url)
-      .success(function (data) {
-        result = data;
-      })
-      .error(function () {
-        horizon.alert('error', gettext('Unable to get detail resource.'));
-        result = false;
-      });
-    return result;
+    return this.syncAjax(
+      WEBROOT + 'api/conveyor/resources/' + resType + '/' + resId + '/',
+      'GET',
+      null,
+      gettext('Unable to get detail resource.'));
+  },
+
+  resourceKey: function (resType, resId) {
+    return resType + '/' + resId;
+  },
+
+  /*
+  * Get the detail of several resources with one asynchronous request.
+  * resources is a list of {type: ..., id: ...}, the returned promise is
+  * resolved with an object mapping resourceKey(type, id) to the detail.*/
+  getResourcesDetail: function (resources) {
+    var self = this;
+    var deferred = $.Deferred();
+    if (!resources.length) {
+      return deferred.resolve({}).promise();
+    }
+    $.ajax({
+      url: WEBROOT + 'api/conveyor/resources/batch/',
+      type: 'POST',
+      async: true,
+      data: angular.toJson({resources: resources}),
+      contentType: 'application/json',
+      beforeSend: function (xhr, settings) {
+        xhr.setRequestHeader("X-CSRFToken", $.cookie('csrftoken'));
+      },
+      success: function (data) {
+        var details = {};
+        $.each(data.items, function (idx, item) {
+          if (item.resource) {
+            details[self.resourceKey(item.type, item.id)] = item.resource;
+          }
+        });
+        deferred.resolve(details);
+      },
+      error: function (xhr) {
+        if (xhr.status == 401) {
+          window.location.href = WEBROOT + 'auth/login/?next=' + window.location.href;
+        } else {
+          horizon.alert('error', gettext('Unable to get detail resource.'));
+        }
+        deferred.reject(xhr);
+      }
+    });
+    return deferred.promise();
   },
 
   getResources: function (resType, params) {
-    var result = null;
     var url = WEBROOT + 'api/conveyor/resources/' + resType + '/';
     var queryString = this.formatParams(params);
     if (queryString != '') {
       url += '?' + queryString;
     }
-    $.ajaxSetup({async: false});
-    $.get(url)
-      .success(function (data) {
-        result = data.items;
-      })
-      .error(function () {
-        horizon.alert('error', gettext('Unable to get detail resource.'));
-        result = false;
+    return this.asyncAjax(url, 'GET', null,
+                          gettext('Unable to get detail resource.'))
+      .then(function (result) {
+        return result ? result.items : result;
       });
-    return result;
   },
 
+  // Promise of the compiled client templates of resource balloons by
+  // type, fetched once.
+  resourceTemplates: null,
+
+  getResourceTemplates: function () {
+    if (this.resourceTemplates === null) {
+      var templates = {};
+      this.resourceTemplates = $.ajax({
+        url: WEBROOT + 'api/conveyor/plans/detail_templates/',
+        type: 'GET',
+        async: true
+      }).then(function (data) {
+        $.each(data.templates, function (type, source) {
+          templates[type] = Hogan.compile(source);
+        });
+        return templates;
+      }, function (xhr) {
+        // Balloons are then rendered by the server.
+        console.log(xhr);
+        return $.Deferred().resolve(templates).promise();
+      });
+    }
+    return this.resourceTemplates;
+  },
+
+  /*
+  * Get the edit balloon of a plan resource. The returned promise is
+  * resolved with {data: html, image: url}, or with false when it can not
+  * be retrieved. Types having a client template are rendered here from
+  * their properties, others by the server.*/
   getResourceView: function (planId, data) {
-    return this.syncAjax(
-      WEBROOT + 'api/conveyor/plans/' + planId + '/detail_resource/' + data.resource_id + '/',
-      'POST',
-      angular.toJson(data),
-      gettext('Unable to retrieve resource detail.'));
+    var self = this;
+    var url = WEBROOT + 'api/conveyor/plans/' + planId + '/detail_resource/' + data.resource_id + '/';
+    var type = data.resource_type.split('::').pop().toLowerCase();
+    return this.getResourceTemplates().then(function (templates) {
+      var template = templates[type];
+      if (!template) {
+        return self.asyncAjax(
+          url,
+          'POST',
+          angular.toJson(data),
+          gettext('Unable to retrieve resource detail.'));
+      }
+      return self.asyncAjax(
+        url + 'properties/',
+        'POST',
+        angular.toJson(data),
+        gettext('Unable to retrieve resource detail.'))
+        .then(function (result) {
+          if (!result) {
+            return result;
+          }
+          return {data: template.render(result), image: result.image};
+        });
+    });
   },
 
-  addRuleForFrontend: function (sg_id, data) {
-    var result = null;
-    $.ajaxSetup({async: false});
-    $.get(WEBROOT + 'conveyor/security_groups/add_rule/?security_group_id=' + sg_id)
-      .success(function (data) {
-        result = data;
-      });
-    return result;
+  addRuleForFrontend: function (sg_id) {
+    return this.asyncAjax(
+      WEBROOT + 'conveyor/security_groups/add_rule/?security_group_id=' + sg_id,
+      'GET',
+      null,
+      gettext('Unable to get the form of security group rule.'));
   },
 
   createSGRule: function (sg_id, data) {
-    return this.syncAjax(
+    return this.asyncAjax(
       WEBROOT + 'api/conveyor/security_groups/create_rule/',
       'POST',
       angular.toJson(data),
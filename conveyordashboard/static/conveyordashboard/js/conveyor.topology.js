@@ -14,12 +14,22 @@ var conveyorPlanTopology = {
   info_box: '#info_box',
   graph: null,
   force: null,
+  layout: null,
   node: [],
   link: [],
   nodes: [],
   links: [],
-  loadingFromJson: function (deps) {
+  // Where the full nodes of a compact topology come from, see setNodeSource.
+  nodeSource: null,
+  fullNodes: {},
+  hoveredId: null,
+  /*
+  * Draw deps. layout, when given, holds the node coordinates computed by the
+  * server ({width: w, height: h, positions: {id: [x, y]}}) and replaces the
+  * force simulation.*/
+  loadingFromJson: function (deps, layout) {
     var self = this;
+    self.layout = layout || null;
 
     var width = $(self.svg_container).width();
     if(width == 0) {width = 700;}
@@ -38,12 +48,15 @@ var conveyorPlanTopology = {
       .linkDistance(90)
       .size([width, height])
       .on("tick", function () {
-        self.link.attr('d', self.drawLink).style('stroke-width', 3).attr('marker-end', "url(#end)");
-        self.node.attr("transform", function(d) { return "translate(" + d.x + "," + d.y + ")"; });
+        self.tick();
       });
     self.svg = d3.select(self.svg_container).append("svg")
       .attr("width", width)
       .attr("height", height);
+    if (self.layout && (self.layout.width > width || self.layout.height > height)) {
+      self.svg.attr("viewBox", "0 0 " + self.layout.width + " " + self.layout.height)
+        .attr("preserveAspectRatio", "xMidYMid meet");
+    }
     self.node = self.svg.selectAll(".node");
     self.link = self.svg.selectAll(".link");
     self.needs_update = false;
@@ -74,13 +87,146 @@ var conveyorPlanTopology = {
 
     self.loadingThumbnail();
   },
+  /*
+  * Decode the topology of a build_resources_topo or clustered_topo response
+  * into the nodes drawn here and their layout, {topo: [...], layout: {...}}.
+  * Topologies asked with format=compact come as columns: ids and types are
+  * interned, the dependencies of the i-th node are deps[offsets[i]] to
+  * deps[offsets[i + 1] - 1], indexes in ids.*/
+  decodeTopo: function (data) {
+    var topo = data.topo;
+    if (!topo || topo.format !== 'compact') {
+      return {topo: topo, layout: data.layout};
+    }
+    var layout = null;
+    if (topo.layout) {
+      layout = {width: topo.layout.width, height: topo.layout.height, positions: {}};
+    }
+    var nodes = [];
+    for (var i = 0; i < topo.count; i++) {
+      var id = topo.ids[i];
+      var node = {
+        id: id,
+        name: topo.name[i] === null ? id : topo.name[i],
+        type: topo.types[topo.type[i]],
+        name_in_template: topo.name_in_template[i],
+        dependencies: []
+      };
+      if (topo.is_cloned[i] !== null) {
+        node.is_cloned = topo.is_cloned[i] === 1;
+      }
+      if (topo.clusters[i]) {
+        $.extend(node, topo.clusters[i]);
+      }
+      for (var j = topo.offsets[i]; j < topo.offsets[i + 1]; j++) {
+        var dep = topo.deps[j];
+        node.dependencies.push({
+          id: topo.ids[dep],
+          type: topo.types[topo.type[dep]],
+          name_in_template: topo.name_in_template[dep],
+          is_cloned: topo.dep_cloned[j] === 1
+        });
+      }
+      if (layout && topo.layout.x[i] !== null) {
+        layout.positions[id] = [topo.layout.x[i], topo.layout.y[i]];
+      }
+      nodes.push(node);
+    }
+    return {topo: nodes, layout: layout};
+  },
+  /*
+  * The nodes drawn come from the compact topology of planId, built with the
+  * JSON availability zone map azMap. The fields it leaves out are then
+  * fetched for the nodes hovered.*/
+  setNodeSource: function (planId, azMap) {
+    this.nodeSource = {planId: planId, azMap: azMap};
+    this.fullNodes = {};
+  },
+  /*
+  * Get the full nodes of a topology decoded from the compact format, with
+  * the fields it leaves out like properties. azMap is the JSON
+  * availability zone map the topology was built with.*/
+  fetchNodes: function (planId, azMap, ids) {
+    return $.ajax({
+      url: WEBROOT + 'api/conveyor/plans/' + planId + '/topo_nodes/',
+      data: {availability_zone_map: azMap, ids: ids.join(',')},
+      dataType: 'json'
+    }).then(function (data) {
+      return data.items;
+    });
+  },
+  /*
+  * Give node the fields left out by the compact format, once. The returned
+  * promise is resolved once they are known.*/
+  completeNode: function (node) {
+    var self = this;
+    var source = self.nodeSource;
+    if (!source || node.cluster) {
+      return $.Deferred().resolve(node).promise();
+    }
+    if (!self.fullNodes[node.id]) {
+      self.fullNodes[node.id] = self.fetchNodes(source.planId, source.azMap, [node.id])
+        .then(function (items) {
+          return items[0] || {};
+        }, function () {
+          delete self.fullNodes[node.id];
+          return $.Deferred().resolve({}).promise();
+        });
+    }
+    return self.fullNodes[node.id].then(function (full) {
+      $.each(full, function (key, value) {
+        if (!(key in node)) {
+          node[key] = value;
+        }
+      });
+      return node;
+    });
+  },
   loading: function () {
     var deps = $("#d3_data").data("d3_data");
+    var layout = $("#d3_data").data("d3_layout");
     this.initPlan(deps);
-    this.loadingFromJson(deps);
+    this.loadingFromJson(deps, layout);
+  },
+  tick: function () {
+    this.link.attr('d', this.drawLink).style('stroke-width', 3).attr('marker-end', "url(#end)");
+    this.node.attr("transform", function(d) { return "translate(" + d.x + "," + d.y + ")"; });
+  },
+  /*
+  * Give nodes their server side coordinates. Returns false when some node
+  * has no position and the force simulation has to place it.*/
+  placeNodes: function () {
+    var self = this;
+    if (!self.layout) {
+      return false;
+    }
+    var placed = true;
+    $.each(self.nodes, function (idx, node) {
+      var pos = self.layout.positions[node.id];
+      if (pos) {
+        node.x = node.px = pos[0];
+        node.y = node.py = pos[1];
+        node.fixed = true;
+      } else if (node.x === undefined) {
+        placed = false;
+      }
+    });
+    // Without the simulation links keep their node indexes.
+    $.each(self.links, function (idx, link) {
+      if (typeof link.source === 'number') {
+        link.source = self.nodes[link.source];
+      }
+      if (typeof link.target === 'number') {
+        link.target = self.nodes[link.target];
+      }
+    });
+    return placed;
   },
   loadingThumbnail: function () {
     var self = this;
+    if (self.layout) {
+      return self.loadingStaticThumbnail();
+    }
     //thumbnail
     var thumbnailNodes=[];
     var thumbnailEdges=[];
@@ -144,6 +290,41 @@ var conveyorPlanTopology = {
       });
     });
   },
+  loadingStaticThumbnail: function () {
+    var self = this;
+    var size = 200;
+    var scale = Math.min(size / (self.layout.width || 1), size / (self.layout.height || 1));
+    var svgThumbnail = d3.select(self.thumbnail_container)
+      .append("svg")
+      .attr("width", size)
+      .attr("height", size);
+    svgThumbnail.selectAll("line")
+      .data(self.links)
+      .enter()
+      .append("line")
+      .style("stroke","#999")
+      .style("stroke-width",2)
+      .attr("x1",function(d){ return d.source.x * scale; })
+      .attr("y1",function(d){ return d.source.y * scale; })
+      .attr("x2",function(d){ return d.target.x * scale; })
+      .attr("y2",function(d){ return d.target.y * scale; });
+    svgThumbnail.selectAll("circle")
+      .data(self.nodes)
+      .enter()
+      .append("circle")
+      .attr("r",4)
+      .style({"fill":"black","cursor":"pointer"})
+      .attr("id",function(d){ return d.id; })
+      .attr("cx",function(d){ return d.x * scale; })
+      .attr("cy",function(d){ return d.y * scale; });
+    $(self.thumbnail_container).find('circle').each(function(i, e){
+      $(this).hover(function(){
+        $(".thbDetail").html("name:" + $(this).attr("id"));
+      },function(){
+        $(".thbDetail").html("");
+      });
+    });
+  },
   clearCavens: function () {
     angular.element(self.svg_container).html('');
     angular.element(self.thumbnail_container).find('svg').remove();
@@ -266,10 +447,22 @@ var conveyorPlanTopology = {
     return WEBROOT + "static/conveyordashboard/img/" + nodeType + '-' + color + ".svg";
   },
   nodeInfo: function (d) {
+    if (d.cluster) {
+      var types = $.map(d.types, function (count, type) {
+        return '<p>' + type + ': ' + count + '</p>';
+      });
+      return '<img src="' + this.nodeImageUrl(d) + '" width="35px" height="35px" />' +
+        '<p>' + gettext('Cluster') + ': ' + d.name_in_template + '</p>' +
+        types.join('') +
+        '<p>' + gettext('Click to expand') + '</p>';
+    }
+    // Compact topologies only have it once completeNode is done.
+    var zone = d.availability_zone || (d.properties || {}).availability_zone;
     return '<img src="' + this.nodeImageUrl(d) + '" width="35px" height="35px" />' +
       '<p>' + gettext('Name') + ': ' + d.name_in_template + '</p>' +
       '<p>' + gettext('Type') + ': ' + d.type + '</p>' +
-      '<p>' + gettext('Id') + ': ' + d.id + '</p>'
+      '<p>' + gettext('Id') + ': ' + d.id + '</p>' +
+      (zone ? '<p>' + gettext('Availability Zone') + ': ' + zone + '</p>' : '');
   },
   update: function () {
     var self = this;
@@ -282,6 +475,7 @@ var conveyorPlanTopology = {
       .attr('node_id', function(d) { return d.id; })
       .attr('node_type', function(d) { return d.type; })
       .attr('cloned', function (d) { return d.is_cloned})
+      .attr('cluster', function (d) { return d.cluster || null; })
       .call(self.force.drag);
 
     nodeEnter.append('image')
@@ -292,6 +486,13 @@ var conveyorPlanTopology = {
       .attr("width", function(d) { return 50; })
       .attr("height", function(d) { return 50; })
       .attr("clip-path","url(#clipCircle)");
+    // Clusters show the number of resources they collapse.
+    nodeEnter.filter(function (d) { return d.cluster; })
+      .append('text')
+      .attr('class', 'cluster_count')
+      .attr('text-anchor', 'middle')
+      .attr('y', 40)
+      .text(function (d) { return d.count; });
     self.node.exit().remove();
 
     self.link.enter().insert("path", "g.node")
@@ -301,13 +502,24 @@ var conveyorPlanTopology = {
 
     //Setup click action for all nodes
     self.node.on("mouseover", function(d) {
+      self.hoveredId = d.id;
       $(self.info_box).html(self.nodeInfo(d));
+      self.completeNode(d).done(function (node) {
+        if (self.hoveredId === node.id) {
+          $(self.info_box).html(self.nodeInfo(node));
+        }
+      });
     });
     self.node.on("mouseout", function(d) {
+      self.hoveredId = null;
       $(self.info_box).html('');
     });
 
-    self.force.start();
+    if (self.placeNodes()) {
+      self.tick();
+    } else {
+      self.force.start();
+    }
   },
   updateTopo: function (json){
     if (json.length === 0) {
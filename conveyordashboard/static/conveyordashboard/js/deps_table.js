@@ -57,3 +57,33 @@ var depsTreeTableAndCallTopo = function () {
     $(plan_deps_table).css({'display': 'block'});
   }
 };
+
+/*
+* Load the dependencies table and the topology of a plan after the page
+* holding them is shown, then draw them and trigger 'topology:loaded' on
+* the topology container.*/
+var loadDepsTableAndTopo = function (planId, depsTableUrl, azMap) {
+  var params = {availability_zone_map: azMap};
+  return $.when(
+    $.ajax({
+      url: WEBROOT + 'api/conveyor/plans/' + planId + '/build_resources_topo/',
+      data: $.extend({format: 'compact'}, params),
+      dataType: 'json'
+    }),
+    $.ajax({url: depsTableUrl, data: params, dataType: 'html'})
+  ).done(function (data, depsTable) {
+    var topo = conveyorPlanTopology.decodeTopo(data[0]);
+    $('#plan_deps_table').html(depsTable[0]);
+    $('#d3_data').data({d3_data: topo.topo, d3_layout: topo.layout});
+    conveyorPlanTopology.setNodeSource(planId, azMap);
+    depsTreeTableAndCallTopo();
+    conveyorPlanTopology.loading();
+    $('#topology_container').trigger('topology:loaded');
+  }).fail(function (xhr) {
+    if (xhr.status == 401) {
+      window.location.href = WEBROOT + 'auth/login/?next=' + window.location.href;
+    } else {
+      horizon.alert('error', gettext('Unable to retrieve plan topology.'));
+    }
+  });
+};
@@ -48,11 +48,15 @@ var conveyorEditPlanRes = {
     var plan_id = $(this.tag_plan_id).val();
 
     // Get resource from server
-    var resView = conveyorService.getResourceView(plan_id, conveyorPlan.extractResourceShowInfo(plan_id, node_type, node_id));
-
-    if(! resView) {
-      return false;
-    }
+    conveyorService.getResourceView(plan_id, conveyorPlan.extractResourceShowInfo(plan_id, node_type, node_id))
+      .done(function (resView) {
+        if(resView) {
+          self.showResView(node_type, node_id, resView);
+        }
+      });
+  },
+  showResView: function (node_type, node_id, resView) {
+    var self = this;
     $("image#" + node_id).attr("href", resView.image);
     var click_img = resView.image;
     if(click_img != "") {
@@ -87,6 +91,7 @@ var conveyorEditPlanRes = {
 
   saveTableInfo: function () {
     var self = this;
+    var pending = false;
     try {
       if(self.isUpdating){return false;}
       self.isUpdating = true;
@@ -96,13 +101,19 @@ var conveyorEditPlanRes = {
       var result = conveyorResources.process(resource_type, resource_id);
       var data = result.data;
       if(Object.keys(data).length){
-        conveyorPlan.updatePlanResource(planId, resource_type, resource_id, result);
-        if(result.needPosted) {
-          conveyorPlanTopology.updateTopo(conveyorPlan.getPlan(planId).updated_deps);
-          $('g.node[cloned=false]').unbind('click').bind('click', function () {
-            conveyorEditPlanRes.nodeClick(this);
+        pending = true;
+        conveyorPlan.updatePlanResource(planId, resource_type, resource_id, result)
+          .done(function () {
+            if(result.needPosted) {
+              conveyorPlanTopology.updateTopo(conveyorPlan.getPlan(planId).updated_deps);
+              $('g.node[cloned=false]').unbind('click').bind('click', function () {
+                conveyorEditPlanRes.nodeClick(this);
+              });
+            }
+          })
+          .always(function () {
+            self.isUpdating = false;
           });
-        }
       }
       self.clearEditing();
       $("#conveyor_plan_topology").show();
@@ -112,9 +123,12 @@ var conveyorEditPlanRes = {
       return false;
     } catch(err){
       console.log(err);
+      pending = false;
       return false;
     } finally{
-      self.isUpdating = false;
+      if (!pending) {
+        self.isUpdating = false;
+      }
     }
   },
   updatePlanDeps: function(planDeps) {
@@ -153,8 +167,12 @@ var conveyorEditPlanRes = {
           if($("form#create_security_group_rule_form").length){
             return;
           }
-          var rsp = conveyorService.addRuleForFrontend($('#secgroup_wrap').attr('os_id'));
-          conveyorEditPlanRes.popAddRuleModalForm(rsp, 'create_security_group_rule_form', conveyorEditPlanRes.addSGRuleForSG);
+          conveyorService.addRuleForFrontend($('#secgroup_wrap').attr('os_id'))
+            .done(function (rsp) {
+              if (rsp) {
+                conveyorEditPlanRes.popAddRuleModalForm(rsp, 'create_security_group_rule_form', conveyorEditPlanRes.addSGRuleForSG);
+              }
+            });
           return false;
         }
       });
@@ -237,16 +255,18 @@ var conveyorEditPlanRes = {
       'ethertype': $("#id_ethertype").val()
     };
 
-    var result = conveyorService.createSGRule($("#secgroup_wrap").attr('od_id'), secgroup_rule);
-    if(result) {
-       var sgr = result.sgr;
-        var sgrs_node = $("#id_sgrs");
-        var ori_rs = $.parseJSON($(sgrs_node).attr("data-ori"));
-        ori_rs.push(sgr);
-        $(sgrs_node).attr({"data-ori": JSON.stringify(ori_rs), "changed": true});
-        $("table#rules tbody").append($(result.sgr_html).find("tbody tr").prop("outerHTML"));
-        conveyorEditPlanRes.openDeleteOperation('form table#rules', '#rules__action_delete_rule');
-    }
+    conveyorService.createSGRule($("#secgroup_wrap").attr('od_id'), secgroup_rule)
+      .done(function (result) {
+        if(result) {
+          var sgr = result.sgr;
+          var sgrs_node = $("#id_sgrs");
+          var ori_rs = $.parseJSON($(sgrs_node).attr("data-ori"));
+          ori_rs.push(sgr);
+          $(sgrs_node).attr({"data-ori": JSON.stringify(ori_rs), "changed": true});
+          $("table#rules tbody").append($(result.sgr_html).find("tbody tr").prop("outerHTML"));
+          conveyorEditPlanRes.openDeleteOperation('form table#rules', '#rules__action_delete_rule');
+        }
+      });
     return false;
   },
   popResEditModal: function (resType, resId, data) {
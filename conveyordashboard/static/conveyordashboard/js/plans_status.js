@@ -0,0 +1,135 @@
+/**
+ * Copyright 2017 Huawei, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*
+* Refresh the rows of plans whose status changed, reloading them through
+* their horizon update url. The status of the rows in a transitional status
+* is polled in a single request. Where the server enables it, rows carry
+* data-plan-events and transitions are pushed as server-sent events
+* instead, when the browser supports EventSource.*/
+var conveyorPlanStatus = {
+  rowSelector: 'tr.warning.batch-update',
+  eventsUrl: WEBROOT + 'api/conveyor/plans/events/',
+  // Upper bound of the poll interval in milliseconds, as horizon does.
+  maxInterval: 30 * 1000,
+  decay: 0,
+  poll: function () {
+    var self = this;
+    var $rows = $(self.rowSelector);
+    if ($rows.length == 0) {
+      return;
+    }
+    var interval = parseInt($rows.attr('data-update-interval'), 10);
+    var ids = $rows.map(function () {
+      return $(this).attr('data-object-id');
+    }).get();
+
+    $.ajax({
+      url: WEBROOT + 'api/conveyor/plans/statuses/',
+      data: {ids: ids.join(',')},
+      dataType: 'json'
+    }).then(function (data) {
+      var statuses = {};
+      $.each(data.items, function (idx, item) {
+        statuses[item.plan_id] = item;
+      });
+      var updates = [];
+      $rows.each(function () {
+        var $row = $(this);
+        var status = statuses[$row.attr('data-object-id')];
+        if (!status ||
+            status.plan_status != $row.attr('data-plan-status') ||
+            (status.task_status || '') != $row.attr('data-task-status')) {
+          updates.push(self.updateRow($row));
+        }
+      });
+      if (updates.length > 0) {
+        self.decay = 0;
+      }
+      return $.when.apply($, updates);
+    }).always(function () {
+      self.decay++;
+      var nextPoll = Math.min(interval * self.decay, self.maxInterval);
+      setTimeout(function () { self.poll(); }, nextPoll);
+    });
+  },
+  watch: function () {
+    var self = this;
+    // Only plans in a transitional status are watched.
+    var $rows = $(self.rowSelector);
+    if ($rows.length == 0) {
+      return;
+    }
+    if (!window.EventSource || $rows.attr('data-plan-events') != 'true') {
+      return self.poll();
+    }
+    var source = new EventSource(self.eventsUrl);
+    var onStatuses = function (e) {
+      var items = JSON.parse(e.data);
+      $.each($.isArray(items) ? items : [items], function (idx, item) {
+        self.statusChanged(item);
+      });
+    };
+    source.addEventListener('snapshot', onStatuses);
+    source.addEventListener('status', onStatuses);
+    source.onerror = function () {
+      // The browser reconnects by itself unless the stream is refused.
+      if (source.readyState == EventSource.CLOSED) {
+        self.poll();
+      }
+    };
+  },
+  statusChanged: function (item) {
+    var $row = $('tr.batch-update[data-object-id="' + item.plan_id + '"]');
+    if ($row.length &&
+        (item.plan_status != $row.attr('data-plan-status') ||
+         (item.task_status || '') != $row.attr('data-task-status'))) {
+      this.updateRow($row);
+    }
+  },
+  updateRow: function ($row) {
+    var $table = $row.closest('table.datatable');
+    return horizon.ajax.queue({
+      url: $row.attr('data-update-url'),
+      success: function (data) {
+        var $newRow = $(data);
+        var $checkbox = $row.find('.table-row-multi-select');
+        if ($checkbox.length && $checkbox[0].checked) {
+          $newRow.find('.table-row-multi-select').prop('checked', true);
+        }
+        $row.replaceWith($newRow);
+        $table.trigger('update');
+      },
+      error: function (xhr) {
+        // The plan is gone.
+        if (xhr.status == 404) {
+          horizon.datatables.update_footer_count($table, -1);
+          $row.remove();
+          $table.trigger('update');
+        } else {
+          $row.removeClass('batch-update');
+        }
+      },
+      complete: function () {
+        horizon.datatables.validate_button();
+      }
+    });
+  }
+};
+
+$(function () {
+  conveyorPlanStatus.watch();
+});
@@ -0,0 +1,94 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+from django.utils import timezone
+import mock
+
+from conveyordashboard import api
+from conveyordashboard.test import helpers as test
+
+
+class ClientPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(ClientPoolTests, self).setUp()
+        self.pool = api.ClientPool(max_size=2)
+        self.factory = mock.Mock(side_effect=lambda: object())
+
+    def test_get_reuses_client(self):
+        c = self.pool.get('a', None, self.factory)
+        self.assertIs(c, self.pool.get('a', None, self.factory))
+        self.assertEqual(1, self.factory.call_count)
+        stats = self.pool.stats()
+        self.assertEqual((1, 1), (stats['hits'], stats['misses']))
+
+    def test_least_recently_used_evicted(self):
+        a = self.pool.get('a', None, self.factory)
+        self.pool.get('b', None, self.factory)
+        self.pool.get('a', None, self.factory)
+        self.pool.get('c', None, self.factory)
+
+        self.assertIs(a, self.pool.get('a', None, self.factory))
+        self.pool.get('b', None, self.factory)
+        self.assertEqual(4, self.factory.call_count)
+        self.assertEqual(2, self.pool.stats()['size'])
+        self.assertEqual(2, self.pool.stats()['evictions'])
+
+    def test_expired_client_replaced(self):
+        expired = timezone.now() - datetime.timedelta(seconds=1)
+        c = self.pool.get('a', expired, self.factory)
+        self.assertIsNot(c, self.pool.get('a', None, self.factory))
+        self.assertEqual(2, self.factory.call_count)
+        self.assertEqual(1, self.pool.stats()['evictions'])
+
+    def test_expired_clients_dropped_on_insert(self):
+        expired = timezone.now() - datetime.timedelta(seconds=1)
+        valid = timezone.now() + datetime.timedelta(hours=1)
+        self.pool.get('a', expired, self.factory)
+        self.pool.get('b', valid, self.factory)
+        self.assertEqual(1, self.pool.stats()['size'])
+
+    def test_clear(self):
+        self.pool.get('a', None, self.factory)
+        self.pool.clear()
+        self.pool.get('a', None, self.factory)
+        self.assertEqual(2, self.factory.call_count)
+
+
+class ConveyorClientTests(test.TestCase):
+
+    def setUp(self):
+        super(ConveyorClientTests, self).setUp()
+        patcher = mock.patch.object(api, '_create_client',
+                                    side_effect=lambda *args: object())
+        self.addCleanup(patcher.stop)
+        self.create_client = patcher.start()
+        self.credentials = ('http://conveyor:9999/v1', 'token-1', False,
+                            None)
+
+    def test_clients_pooled_by_credentials(self):
+        with mock.patch.object(api, 'CLIENT_POOL', api.ClientPool()):
+            c = api.conveyorclient_for(self.credentials)
+            self.assertIs(c, api.conveyorclient_for(self.credentials))
+            other = ('http://conveyor:9999/v1', 'token-2', False, None)
+            self.assertIsNot(c, api.conveyorclient_for(other))
+        self.assertEqual(2, self.create_client.call_count)
+
+    def test_pool_disabled(self):
+        with mock.patch.object(api, 'CLIENT_POOL', api.ClientPool(0)):
+            c = api.conveyorclient_for(self.credentials)
+            self.assertIsNot(c, api.conveyorclient_for(self.credentials))
+        self.assertEqual(2, self.create_client.call_count)
@@ -0,0 +1,125 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from conveyordashboard.api import api
+from conveyordashboard.test import helpers as test
+
+PAGE_SIZE = 2
+
+
+class UpdatePaginationTests(test.TestCase):
+
+    def test_first_page(self):
+        self.assertEqual(([1, 2], True, False),
+                         api.update_pagination([1, 2, 3], PAGE_SIZE, None,
+                                               'desc'))
+
+    def test_single_page(self):
+        self.assertEqual(([1], False, False),
+                         api.update_pagination([1], PAGE_SIZE, None, 'desc'))
+
+    def test_middle_page(self):
+        self.assertEqual(([3, 4], True, True),
+                         api.update_pagination([3, 4, 5], PAGE_SIZE, 2,
+                                               'desc'))
+
+    def test_last_page(self):
+        self.assertEqual(([5], False, True),
+                         api.update_pagination([5], PAGE_SIZE, 4, 'desc'))
+
+    def test_first_page_reached_back(self):
+        self.assertEqual(([2, 1], True, False),
+                         api.update_pagination([2, 1], PAGE_SIZE, 3, 'asc'))
+
+
+@mock.patch.object(api.utils, 'get_page_size',
+                   mock.Mock(return_value=PAGE_SIZE))
+class PaginateListTests(test.TestCase):
+
+    def setUp(self):
+        super(PaginateListTests, self).setUp()
+        self.entities = [{'id': str(i)} for i in range(1, 6)]
+
+    def _ids(self, result):
+        page, has_more, has_prev = result
+        return [e['id'] for e in page], has_more, has_prev
+
+    def test_first_page(self):
+        self.assertEqual(
+            (['1', '2'], True, False),
+            self._ids(api.paginate_list(self.request, self.entities)))
+
+    def test_next_page(self):
+        self.assertEqual(
+            (['3', '4'], True, True),
+            self._ids(api.paginate_list(self.request, self.entities, '2')))
+
+    def test_last_page(self):
+        self.assertEqual(
+            (['5'], False, True),
+            self._ids(api.paginate_list(self.request, self.entities, '4')))
+
+    def test_previous_page(self):
+        # Pages going back come in reverse order, as from conveyor.
+        self.assertEqual(
+            (['4', '3'], True, True),
+            self._ids(api.paginate_list(self.request, self.entities, '5',
+                                        'asc')))
+
+    def test_previous_first_page(self):
+        self.assertEqual(
+            (['2', '1'], True, False),
+            self._ids(api.paginate_list(self.request, self.entities, '3',
+                                        'asc')))
+
+    def test_unknown_marker(self):
+        self.assertEqual(
+            (['1', '2'], True, False),
+            self._ids(api.paginate_list(self.request, self.entities,
+                                        'gone', 'asc')))
+
+    def test_key(self):
+        entities = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+        page, has_more, has_prev = api.paginate_list(
+            self.request, entities, 'a', key='name')
+        self.assertEqual(entities[1:], page)
+
+
+@mock.patch.object(api.utils, 'get_page_size',
+                   mock.Mock(return_value=PAGE_SIZE))
+class PaginatedTests(test.TestCase):
+
+    def test_paginate(self):
+        list_func = mock.Mock(return_value=['3', '4', '5'])
+        result = api.paginated(self.request, list_func,
+                               search_opts={'paginate': True, 'marker': '2',
+                                            'status': 'ACTIVE'})
+
+        self.assertEqual((['3', '4'], True, True), result)
+        list_func.assert_called_once_with(
+            self.request, search_opts={'status': 'ACTIVE',
+                                       'limit': PAGE_SIZE + 1,
+                                       'sort_dir': 'desc',
+                                       'marker': '2'})
+
+    def test_no_paginate(self):
+        list_func = mock.Mock(return_value=['1', '2', '3'])
+        result = api.paginated(self.request, list_func,
+                               search_opts={'status': 'ACTIVE'})
+
+        self.assertEqual((['1', '2', '3'], False, False), result)
+        list_func.assert_called_once_with(
+            self.request, search_opts={'status': 'ACTIVE'})
@@ -0,0 +1,94 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from conveyordashboard.api import api
+from conveyordashboard.test import helpers as test
+
+PLANS = (
+    ('plan-1', 'web-server', 'available', '2017-01-05T00:00:00'),
+    ('plan-2', 'Web', 'cloning', '2017-01-04T00:00:00'),
+    ('plan-3', 'db-web', 'available', '2017-01-03T00:00:00'),
+    ('plan-4', 'database', 'error', '2017-01-02T00:00:00'),
+    ('plan-5', 'website', 'available', '2017-01-01T00:00:00'),
+)
+
+
+@mock.patch.object(api.utils, 'get_page_size', mock.Mock(return_value=2))
+class PlanSearchTests(test.TestCase):
+
+    def setUp(self):
+        super(PlanSearchTests, self).setUp()
+        self.client = self.mock_client()
+        # Listed oldest first, the index sorts them newest first.
+        self.client.plans.list.side_effect = lambda opts: [
+            test.FakeResource(None, {'plan_id': plan_id,
+                                     'plan_name': name,
+                                     'plan_status': status,
+                                     'created_at': created_at})
+            for plan_id, name, status, created_at in reversed(PLANS)]
+
+    def _search(self, field, query, marker=None, sort_dir='desc'):
+        plans, has_more, has_prev = api.plan_search(
+            self.request, field, query, marker=marker, sort_dir=sort_dir)
+        return [p.plan_id for p in plans], has_more, has_prev
+
+    def test_name_prefix_matches_first(self):
+        with mock.patch.object(api.utils, 'get_page_size',
+                               mock.Mock(return_value=10)):
+            self.assertEqual(
+                (['plan-1', 'plan-2', 'plan-5', 'plan-3'], False, False),
+                self._search('plan_name', 'WEB'))
+
+    def test_name_pages(self):
+        self.assertEqual((['plan-1', 'plan-2'], True, False),
+                         self._search('plan_name', 'web'))
+        self.assertEqual((['plan-5', 'plan-3'], False, True),
+                         self._search('plan_name', 'web', 'plan-2'))
+        self.assertEqual((['plan-2', 'plan-1'], True, False),
+                         self._search('plan_name', 'web', 'plan-5', 'asc'))
+
+    def test_status_matches_exactly(self):
+        with mock.patch.object(api.utils, 'get_page_size',
+                               mock.Mock(return_value=10)):
+            self.assertEqual(
+                (['plan-1', 'plan-3', 'plan-5'], False, False),
+                self._search('plan_status', 'Available'))
+            self.assertEqual(([], False, False),
+                             self._search('plan_status', 'avail'))
+
+    def test_no_match(self):
+        self.assertEqual(([], False, False),
+                         self._search('plan_name', 'mail'))
+
+    def test_index_cached(self):
+        self._search('plan_name', 'web')
+        self._search('plan_status', 'error')
+
+        self.assertEqual(1, self.client.plans.list.call_count)
+
+    def test_index_not_cached_without_ttl(self):
+        with self.settings(CONVEYOR_PLAN_INDEX_TTL=0):
+            self._search('plan_name', 'web')
+            self._search('plan_name', 'web')
+
+        self.assertEqual(2, self.client.plans.list.call_count)
+
+    def test_plan_delete_invalidates_index(self):
+        self._search('plan_name', 'web')
+        api.plan_delete(self.request, 'plan-4')
+        self._search('plan_name', 'web')
+
+        self.assertEqual(2, self.client.plans.list.call_count)
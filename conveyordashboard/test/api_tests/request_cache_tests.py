@@ -0,0 +1,86 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from conveyordashboard.api import api
+from conveyordashboard.common import constants as consts
+from conveyordashboard.test import helpers as test
+
+
+class RequestCacheTests(test.TestCase):
+
+    def setUp(self):
+        super(RequestCacheTests, self).setUp()
+        self.client = self.mock_client()
+        self.client.resources.list.side_effect = lambda opts: [
+            test.FakeResource(None, {'id': 'server-1', 'name': 'vm'})]
+        self.client.resources.get_resource_detail.side_effect = \
+            lambda res_type, res_id: {'id': res_id, 'name': 'vm'}
+
+    def test_resource_list_fetched_once_per_request(self):
+        first = api.resource_list(self.request, consts.NOVA_SERVER)
+        second = api.resource_list(self.request, consts.NOVA_SERVER)
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, self.client.resources.list.call_count)
+        self.assertEqual(1, api.request_cache_saved_calls(self.request))
+
+    def test_resource_list_keyed_by_search_opts(self):
+        api.resource_list(self.request, consts.NOVA_SERVER)
+        api.resource_list(self.request, consts.NOVA_SERVER,
+                          search_opts={'name': 'vm'})
+        api.resource_list(self.request, consts.NOVA_SERVER,
+                          search_opts={'name': 'vm'})
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_resource_list_not_shared_across_requests(self):
+        api.resource_list(self.request, consts.NOVA_SERVER)
+        api.resource_list(test.create_request(), consts.NOVA_SERVER)
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_resource_get_returns_copies(self):
+        res = api.resource_get(self.request, consts.NOVA_SERVER, 'server-1')
+        res['name'] = 'changed'
+
+        res = api.resource_get(self.request, consts.NOVA_SERVER, 'server-1')
+        self.assertEqual('vm', res['name'])
+        self.assertEqual(
+            1, self.client.resources.get_resource_detail.call_count)
+
+    def test_resource_get_batch(self):
+        self.client.resources.get_resource_detail.side_effect = \
+            lambda res_type, res_id: {'id': res_id}
+        found = api.resource_get_batch(
+            self.request, [(consts.NOVA_SERVER, 'server-1'),
+                           (consts.NOVA_SERVER, 'server-1'),
+                           (consts.NEUTRON_NET, 'net-1')])
+
+        self.assertEqual({(consts.NOVA_SERVER, 'server-1'): {'id': 'server-1'},
+                          (consts.NEUTRON_NET, 'net-1'): {'id': 'net-1'}},
+                         found)
+        self.assertEqual(
+            2, self.client.resources.get_resource_detail.call_count)
+
+    def test_resource_get_batch_leaves_out_failures(self):
+        def get(res_type, res_id):
+            if res_id == 'missing':
+                raise Exception('not found')
+            return {'id': res_id}
+        self.client.resources.get_resource_detail.side_effect = get
+        found = api.resource_get_batch(
+            self.request, [(consts.NOVA_SERVER, 'server-1'),
+                           (consts.NOVA_SERVER, 'missing')])
+
+        self.assertEqual([(consts.NOVA_SERVER, 'server-1')], list(found))
@@ -0,0 +1,75 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.test.utils import override_settings
+import mock
+
+from conveyordashboard.api import api
+from conveyordashboard.api.rest import plans
+from conveyordashboard import exceptions
+from conveyordashboard.test import helpers as test
+
+
+def _plan(plan_id, plan_status='available', task_status=None):
+    return test.FakeResource(None, {'plan_id': plan_id,
+                                    'plan_status': plan_status,
+                                    'task_status': task_status})
+
+
+class PlansGetTests(test.TestCase):
+
+    def test_plans_get(self):
+        client = self.mock_client()
+
+        def get(plan_id):
+            if plan_id == 'gone':
+                raise exceptions.NOT_FOUND[0](404)
+            return _plan(plan_id)
+        client.plans.get.side_effect = get
+
+        found = api.plans_get(self.request, ['plan-2', 'gone', 'plan-1',
+                                             'plan-2'])
+        self.assertEqual(['plan-1', 'plan-2'], sorted(found))
+        self.assertEqual('plan-2', found['plan-2'].plan_id)
+        self.assertEqual(3, client.plans.get.call_count)
+        self.assertFalse(client.plans.list.called)
+
+
+class PlanStatusesTests(test.TestCase):
+
+    def _get(self, ids):
+        request = test.mock_rest_request(GET={'ids': ids})
+        return plans.PlanStatuses().get(request)
+
+    @mock.patch.object(plans.api, 'plans_get')
+    def test_get(self, plans_get):
+        plans_get.return_value = {
+            'plan-1': api.models.Plan(_plan('plan-1', 'cloning',
+                                            'deploying'))}
+        response = self._get('plan-1,plan-2,')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {'items': [{'plan_id': 'plan-1', 'plan_status': 'cloning',
+                        'task_status': 'deploying'}]},
+            json.loads(response.content.decode('utf-8')))
+        self.assertEqual(['plan-1', 'plan-2'], plans_get.call_args[0][1])
+
+    @override_settings(CONVEYOR_RESOURCE_BATCH_SIZE=1)
+    @mock.patch.object(plans.api, 'plans_get')
+    def test_get_too_many(self, plans_get):
+        self.assertEqual(400, self._get('plan-1,plan-2').status_code)
+        self.assertFalse(plans_get.called)
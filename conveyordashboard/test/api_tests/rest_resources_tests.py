@@ -0,0 +1,67 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.test.utils import override_settings
+import mock
+
+from conveyordashboard.api.rest import resources
+from conveyordashboard.common import constants as consts
+from conveyordashboard.test import helpers as test
+
+
+class ResourceBatchTests(test.TestCase):
+
+    def _post(self, body):
+        request = test.mock_rest_request(body=json.dumps(body))
+        return resources.ResourceBatch().post(request)
+
+    @mock.patch.object(resources.api, 'resource_get_batch')
+    def test_post(self, resource_get_batch):
+        resource_get_batch.return_value = {
+            (consts.NEUTRON_NET, 'net-1'): {'id': 'net-1'}}
+        response = self._post({'resources': [
+            {'type': consts.NOVA_SERVER, 'id': 'server-1'},
+            {'type': consts.NEUTRON_NET, 'id': 'net-1'}]})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {'items': [{'type': consts.NOVA_SERVER, 'id': 'server-1',
+                        'resource': None},
+                       {'type': consts.NEUTRON_NET, 'id': 'net-1',
+                        'resource': {'id': 'net-1'}}]},
+            json.loads(response.content.decode('utf-8')))
+        self.assertEqual([(consts.NOVA_SERVER, 'server-1'),
+                          (consts.NEUTRON_NET, 'net-1')],
+                         resource_get_batch.call_args[0][1])
+
+    @mock.patch.object(resources.api, 'resource_get_batch')
+    def test_post_invalid(self, resource_get_batch):
+        for body in ({'resources': {}},
+                     {'resources': [{'type': consts.NOVA_SERVER}]},
+                     {'resources': [{'type': consts.NOVA_SERVER, 'id': 1}]},
+                     ['server-1']):
+            self.assertEqual(400, self._post(body).status_code)
+        self.assertFalse(resource_get_batch.called)
+
+    @override_settings(CONVEYOR_RESOURCE_BATCH_SIZE=1)
+    @mock.patch.object(resources.api, 'resource_get_batch')
+    def test_post_too_many(self, resource_get_batch):
+        response = self._post({'resources': [
+            {'type': consts.NOVA_SERVER, 'id': 'server-1'},
+            {'type': consts.NOVA_SERVER, 'id': 'server-2'}]})
+
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(resource_get_batch.called)
@@ -0,0 +1,92 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test.utils import override_settings
+
+from conveyordashboard.api import api
+from conveyordashboard.common import constants as consts
+from conveyordashboard.test import helpers as test
+
+
+@override_settings(CONVEYOR_RESOURCE_CACHE_TTL={'default': 60})
+class SharedCacheTests(test.TestCase):
+
+    def setUp(self):
+        super(SharedCacheTests, self).setUp()
+        self.client = self.mock_client()
+        self.client.resources.list.side_effect = lambda opts: [
+            test.FakeResource(None, {'id': 'server-1', 'name': 'vm'})]
+
+    def _list(self, request, res_type=consts.NOVA_SERVER):
+        return api.resource_list(request, res_type)
+
+    def test_shared_across_requests(self):
+        first = self._list(self.request)
+        second = self._list(test.create_request(user_id='user-2'))
+
+        self.assertEqual(first, second)
+        self.assertIsInstance(second[0], test.FakeResource)
+        self.assertEqual(1, self.client.resources.list.call_count)
+
+    def test_disabled_without_ttl(self):
+        with self.settings(CONVEYOR_RESOURCE_CACHE_TTL={}):
+            self._list(self.request)
+            self._list(test.create_request())
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_scoped_by_project(self):
+        self._list(self.request)
+        self._list(test.create_request(tenant_id='project-2'))
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_scoped_by_roles(self):
+        self._list(self.request)
+        self._list(test.create_request(user_id='user-2',
+                                       roles=('admin', '_member_')))
+        self._list(test.create_request(user_id='user-3',
+                                       roles=('_member_', 'admin')))
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_keypairs_scoped_by_user(self):
+        self._list(self.request, consts.NOVA_KEYPAIR)
+        self._list(test.create_request(), consts.NOVA_KEYPAIR)
+        self._list(test.create_request(user_id='user-2'),
+                   consts.NOVA_KEYPAIR)
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_invalidate(self):
+        self._list(self.request)
+        api.invalidate_resource_cache(self.request)
+        self._list(test.create_request())
+
+        self.assertEqual(2, self.client.resources.list.call_count)
+
+    def test_invalidate_keeps_other_projects(self):
+        other = test.create_request(tenant_id='project-2')
+        self._list(other)
+        api.invalidate_resource_cache(self.request)
+        self._list(test.create_request(tenant_id='project-2'))
+
+        self.assertEqual(1, self.client.resources.list.call_count)
+
+    def test_clone_invalidates(self):
+        self._list(self.request)
+        api.clone(self.request, 'plan-1', 'az-2', [])
+        self._list(test.create_request())
+
+        self.assertEqual(2, self.client.resources.list.call_count)
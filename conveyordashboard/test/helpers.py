@@ -0,0 +1,78 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.core.cache import cache
+from django import http
+from django import test
+import mock
+
+
+class FakeResource(object):
+    """Stand-in for the resources returned by conveyorclient."""
+
+    def __init__(self, manager, info, loaded=False):
+        self.manager = manager
+        self._info = info
+        for k, v in info.items():
+            setattr(self, k, v)
+
+    def __eq__(self, other):
+        return (isinstance(other, FakeResource) and
+                self._info == other._info)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def create_request(user_id='user-1', tenant_id='project-1',
+                   roles=('_member_',)):
+    request = http.HttpRequest()
+    request.session = {}
+    request.user = mock.Mock(id=user_id, tenant_id=tenant_id,
+                             roles=[{'name': role} for role in roles],
+                             token=mock.Mock(id='token-%s' % user_id,
+                                             expires=None))
+    return request
+
+
+def mock_rest_request(**args):
+    """Return a request as seen by the REST API views."""
+    mock_args = {
+        'user.is_authenticated.return_value': True,
+        'is_ajax.return_value': True,
+        'policy.check.return_value': True,
+        'body': ''
+    }
+    mock_args.update(args)
+    return mock.Mock(**mock_args)
+
+
+class TestCase(test.SimpleTestCase):
+    """Base class of the conveyordashboard unit tests.
+
+    Each test starts with an empty Django cache and has self.request, a
+    request of a member of project-1.
+    """
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.request = create_request()
+
+    def mock_client(self):
+        """Replace the conveyor client of api.api with a mock, returned."""
+        patcher = mock.patch('conveyordashboard.api.conveyorclient')
+        self.addCleanup(patcher.stop)
+        return patcher.start().return_value
@@ -0,0 +1,103 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import imp
+import json
+import os
+
+from conveyordashboard.common import constants as consts
+from conveyordashboard.plans import converters
+from conveyordashboard.test import helpers as test
+
+TAG_RES_TYPE = consts.TAG_RES_TYPE
+
+# The former if/elif chain and its samples are kept by the benchmark.
+BENCH = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                     os.pardir, 'tools', 'bench_update_resources.py')
+
+
+def _convert(res):
+    converters.preprocess_update_resources([res])
+    return res
+
+
+class PreprocessUpdateResourcesTests(test.TestCase):
+
+    def test_same_as_legacy_chain(self):
+        bench = imp.load_source('bench_update_resources', BENCH)
+        resources = bench.build(len(bench.SAMPLES) * 3)
+        legacy = copy.deepcopy(resources)
+        bench.legacy_preprocess(legacy)
+        converters.preprocess_update_resources(resources)
+
+        self.assertEqual(legacy, resources)
+
+    def test_metadata(self):
+        res = _convert({TAG_RES_TYPE: consts.NOVA_SERVER,
+                        'metadata': 'a=1\n\n b=2 \nc'})
+        self.assertEqual({'a': '1', 'b': '2', 'c': ''}, res['metadata'])
+
+    def test_converted_fields_left_as_they_are(self):
+        res = _convert({TAG_RES_TYPE: consts.CINDER_VOLUME,
+                        'metadata': {'a': '1'}, 'size': 2})
+        self.assertEqual({'a': '1'}, res['metadata'])
+        self.assertEqual(2, res['size'])
+
+    def test_subnet(self):
+        res = _convert({TAG_RES_TYPE: consts.NEUTRON_SUBNET,
+                        'from_network_id': 'net-1',
+                        'no_gateway': True,
+                        'gateway_ip': '10.0.0.1',
+                        'allocation_pools': '10.0.0.2,10.0.0.9\n',
+                        'dns_nameservers': ' 8.8.8.8\n\n'})
+        self.assertEqual({TAG_RES_TYPE: consts.NEUTRON_SUBNET,
+                          'gateway_ip': None,
+                          'allocation_pools': [{'start': '10.0.0.2',
+                                                'end': '10.0.0.9'}],
+                          'dns_nameservers': ['8.8.8.8']}, res)
+
+    def test_subnet_keeps_gateway(self):
+        res = _convert({TAG_RES_TYPE: consts.NEUTRON_SUBNET,
+                        'no_gateway': False,
+                        'gateway_ip': '10.0.0.1'})
+        self.assertEqual({TAG_RES_TYPE: consts.NEUTRON_SUBNET,
+                          'gateway_ip': '10.0.0.1'}, res)
+
+    def test_net_value_specs(self):
+        res = _convert({TAG_RES_TYPE: consts.NEUTRON_NET,
+                        'admin_state_up': 'false',
+                        'value_specs': {'router_external': 'True',
+                                        'segmentation_id': '100',
+                                        'network_type': 'vlan'}})
+        self.assertFalse(res['admin_state_up'])
+        self.assertEqual({'router:external': True,
+                          'provider:segmentation_id': 100,
+                          'provider:network_type': 'vlan'},
+                         res['value_specs'])
+
+    def test_security_group_rules(self):
+        rules = [{'id': 'rule-1', 'direction': 'ingress'}]
+        res = _convert({TAG_RES_TYPE: consts.NEUTRON_SECGROUP,
+                        'rules': json.dumps(rules)})
+        self.assertEqual([{'direction': 'ingress'}], res['rules'])
+
+    def test_floating_ip(self):
+        res = _convert({TAG_RES_TYPE: consts.NEUTRON_FLOATINGIP,
+                        'floating_network_id': 'ext-net'})
+        self.assertEqual({TAG_RES_TYPE: consts.NEUTRON_FLOATINGIP}, res)
+
+    def test_other_types_untouched(self):
+        res = {TAG_RES_TYPE: consts.NEUTRON_PORT, 'metadata': 'a=1'}
+        self.assertEqual(copy.deepcopy(res), _convert(res))
@@ -0,0 +1,98 @@
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import override_settings
+import mock
+
+from conveyordashboard.plans import template
+from conveyordashboard.test import helpers as test
+
+TEMPLATE = 'heat_template_version: 2013-05-23\nresources: {}\n'
+
+
+def _upload(content):
+    return SimpleUploadedFile('plan.yaml', content)
+
+
+class CheckTemplateTests(test.TestCase):
+
+    def test_yaml(self):
+        self.assertIsNone(template.check_template(TEMPLATE))
+
+    def test_json(self):
+        self.assertIsNone(template.check_template(' {"resources": {}}'))
+
+    def test_invalid_json(self):
+        message, params = template.check_template('{"resources": ')
+        self.assertIn('error', params)
+
+    def test_invalid_yaml(self):
+        message, params = template.check_template('resources: [a, b')
+        self.assertIn('error', params)
+
+    def test_not_a_mapping(self):
+        for text in ('- a\n- b\n', '', '{}'):
+            message, params = template.check_template(text)
+            self.assertIsNone(params)
+
+
+@override_settings(CONVEYOR_IMPORT_MAX_SIZE=64)
+class LoadUploadTests(test.TestCase):
+
+    def test_valid(self):
+        self.assertEqual(TEMPLATE,
+                         template.load_upload(_upload(TEMPLATE.encode())))
+
+    def test_too_big(self):
+        self.assertRaises(ValidationError, template.load_upload,
+                          _upload(b'a: b\n' * 20))
+
+    def test_too_big_while_read(self):
+        # The size announced may be wrong, the chunks read are counted.
+        upload = _upload(b'a: b\n' * 20)
+        upload.size = 10
+        self.assertRaises(ValidationError, template.read_upload, upload)
+
+    def test_not_utf8(self):
+        self.assertRaises(ValidationError, template.load_upload,
+                          _upload(u'a: \xe9'.encode('latin-1')))
+
+    def test_invalid(self):
+        self.assertRaises(ValidationError, template.load_upload,
+                          _upload(b'- a\n'))
+
+    @override_settings(CONVEYOR_IMPORT_PROCESS_THRESHOLD=1)
+    def test_large_template_parsed_off_thread(self):
+        executor = futures.ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch.object(template.utils, 'get_process_executor',
+                               return_value=executor):
+            self.assertEqual(
+                TEMPLATE, template.load_upload(_upload(TEMPLATE.encode())))
+
+    @override_settings(CONVEYOR_IMPORT_PROCESS_THRESHOLD=1)
+    def test_parse_timeout(self):
+        future = mock.Mock()
+        future.result.side_effect = futures.TimeoutError()
+        executor = mock.Mock()
+        executor.submit.return_value = future
+        with mock.patch.object(template.utils, 'get_process_executor',
+                               return_value=executor):
+            self.assertRaises(ValidationError, template.load_upload,
+                              _upload(TEMPLATE.encode()))
+        future.cancel.assert_called_once_with()
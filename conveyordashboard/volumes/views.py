@@ -18,11 +18,13 @@ from horizon import exceptions
 from horizon import tables
 
 from conveyordashboard.api import api
+from conveyordashboard.common import constants as consts
 from conveyordashboard.common import resource_state
+from conveyordashboard.common import tables as common_tables
 from conveyordashboard.volumes import tables as volume_tables
 
 
-class IndexView(tables.DataTableView):
+class IndexView(common_tables.PagedTableMixin, tables.DataTableView):
     table_class = volume_tables.VolumesTable
     template_name = '_res_table.html'
     page_title = _("Volumes")
@@ -30,16 +32,22 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         volumes = []
         try:
-            volumes = api.volume_list(self.request)
-            volumes = filter(self._status_filter, volumes)
+            marker, sort_dir = self._get_marker()
+            search_opts = {'marker': marker, 'sort_dir': sort_dir,
+                           'paginate': True}
+            status_filter = resource_state.push_clone_state_filter(
+                consts.CINDER_VOLUME, search_opts)
+            volumes, self._has_more_data, self._has_prev_data = \
+                api.paginated(self.request, api.volume_list, search_opts)
+            if sort_dir == "asc":
+                volumes.reverse()
+            if status_filter:
+                volumes = filter(status_filter, volumes)
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve volumes list."))
         return volumes
 
-    def _status_filter(self, volume):
-        return volume.status in resource_state.VOLUME_CLONE_STATE
-
     def get_filters(self, filters):
         filter_action = self.table._meta._filter_action
         if filter_action:
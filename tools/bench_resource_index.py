@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the load balancer VIP / floating IP join.
+
+Compares the former per-pool scan of the floating IP list with the port_id
+index built by conveyordashboard.common.utils.index_by.
+
+    python tools/bench_resource_index.py --pools 5000 --fips 5000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from conveyordashboard.common import utils  # noqa
+
+
+class Obj(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def build(pool_count, fip_count):
+    port_ids = [str(uuid.uuid4()) for _i in range(max(pool_count, fip_count))]
+    fips = [Obj(id=str(uuid.uuid4()), port_id=port_ids[i])
+            for i in range(fip_count)]
+    pools = [Obj(id=str(uuid.uuid4()), vip=Obj(port_id=port_ids[i], fip=None))
+             for i in range(pool_count)]
+    return pools, fips
+
+
+def scan_join(pools, fips):
+    for pool in pools:
+        vip_fip = [fip for fip in fips if fip.port_id == pool.vip.port_id]
+        if vip_fip:
+            pool.vip.fip = vip_fip[0]
+
+
+def index_join(pools, fips):
+    fip_index = utils.index_by(fips, 'port_id')
+    for pool in pools:
+        vip_fip = fip_index.get(pool.vip.port_id)
+        if vip_fip:
+            pool.vip.fip = vip_fip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pools', type=int, default=2000)
+    parser.add_argument('--fips', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pools, fips = build(args.pools, args.fips)
+    for name, join in (('scan', scan_join), ('index', index_join)):
+        best = min(timeit.repeat(lambda: join(pools, fips),
+                                 number=1, repeat=args.repeat))
+        print('%-6s %d pools x %d fips: %.4fs' % (name, args.pools,
+                                                   args.fips, best))
+
+
+if __name__ == '__main__':
+    main()
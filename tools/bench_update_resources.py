@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# Copyright (c) 2017 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the conversion of the update resources of a clone.
+
+Compares the former if/elif chain over resource types with the compiled
+converters of conveyordashboard.plans.converters, and checks that both
+give the same result.
+
+    python tools/bench_update_resources.py --resources 50000
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+
+from oslo_utils import strutils
+import six
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from conveyordashboard.common import constants  # noqa
+from conveyordashboard.plans import converters  # noqa
+
+TAG_RES_TYPE = constants.TAG_RES_TYPE
+
+
+def legacy_preprocess(update_resources):
+    for res in update_resources:
+        res_type = res[TAG_RES_TYPE]
+        if res_type == constants.NOVA_SERVER:
+            if isinstance(res.get('metadata'), six.string_types):
+                meta = [dict(zip(['k', 'v'], item.strip().split('=')))
+                        for item in res['metadata'].split('\n')
+                        if item.strip()]
+                res['metadata'] = dict((i['k'], i.get('v', '')) for i in meta)
+        elif res_type == constants.CINDER_VOLUME:
+            if isinstance(res.get('metadata'), six.string_types):
+                meta = [dict(zip(['k', 'v'], item.strip().split('=')))
+                        for item in res['metadata'].split('\n')
+                        if item.strip()]
+                res['metadata'] = dict((i['k'], i.get('v', '')) for i in meta)
+            if 'size' in res:
+                res['size'] = int(res['size'])
+        elif res_type == constants.NEUTRON_SUBNET:
+            res.pop('from_network_id', None)
+            if 'no_gateway' in res:
+                if res['no_gateway']:
+                    res['gateway_ip'] = None
+                res.pop('no_gateway')
+
+            if 'allocation_pools' in res \
+                    and isinstance(res['allocation_pools'], six.string_types):
+                pools = [dict(zip(['start', 'end'], pool.strip().split(',')))
+                         for pool in res['allocation_pools'].split('\n')
+                         if pool.strip()]
+                res['allocation_pools'] = pools
+            if 'host_routes' in res and isinstance(res['host_routes'],
+                                                   six.string_types):
+                routes = [dict(zip(['destination', 'nexthop'],
+                                   route.strip().split(',')))
+                          for route in res['host_routes'].split('\n')
+                          if route.strip()]
+                res['host_routes'] = routes
+            if 'dns_nameservers' in res and isinstance(res['dns_nameservers'],
+                                                       six.string_types):
+                nameservers = [ns.strip()
+                               for ns in res['dns_nameservers'].split('\n')
+                               if ns.strip()]
+                res['dns_nameservers'] = nameservers
+        elif res_type == constants.NEUTRON_NET:
+            if 'value_specs' in res:
+                val_specs = res['value_specs']
+                if 'router_external' in val_specs:
+                    val_specs['router:external'] = strutils.bool_from_string(
+                        val_specs.pop('router_external'))
+                if 'segmentation_id' in val_specs:
+                    val_specs['provider:segmentation_id'] \
+                        = int(val_specs.pop('segmentation_id'))
+                if 'physical_network' in val_specs:
+                    val_specs['provider:physical_network'] \
+                        = val_specs.pop('physical_network')
+                if 'network_type' in val_specs:
+                    val_specs['provider:network_type'] \
+                        = val_specs.pop('network_type')
+            if 'admin_state_up' in res:
+                res['admin_state_up'] \
+                    = strutils.bool_from_string(res['admin_state_up'])
+        elif res_type == constants.NEUTRON_SECGROUP:
+            if 'rules' in res:
+                rules = res['rules']
+                if isinstance(rules, six.string_types):
+                    rules = json.JSONDecoder().decode(rules)
+                for r in rules:
+                    r.pop('id', None)
+                res['rules'] = rules
+        elif res_type == constants.NEUTRON_FLOATINGIP:
+            res.pop('floating_network_id')
+
+
+def _metadata(i):
+    return '\n'.join('key%d=value%d' % (j, i) for j in range(8))
+
+
+SAMPLES = (
+    lambda i: {TAG_RES_TYPE: constants.NOVA_SERVER,
+               'metadata': _metadata(i)},
+    lambda i: {TAG_RES_TYPE: constants.CINDER_VOLUME,
+               'metadata': _metadata(i), 'size': str(i % 100 + 1)},
+    lambda i: {TAG_RES_TYPE: constants.NEUTRON_PORT,
+               'fixed_ips': [{'ip_address': '10.0.%d.%d' % (i % 250, 5)}]},
+    lambda i: {TAG_RES_TYPE: constants.NEUTRON_SUBNET,
+               'from_network_id': 'net-%d' % i,
+               'no_gateway': i % 2 == 0,
+               'gateway_ip': '10.%d.0.1' % (i % 250),
+               'allocation_pools': '10.0.0.10,10.0.0.100\n'
+                                   '10.0.1.10,10.0.1.100\n',
+               'host_routes': '192.168.200.0/24,10.56.1.254\n'
+                              '192.168.201.0/24,10.56.1.253',
+               'dns_nameservers': '8.8.8.8\n 8.8.4.4 \n\n'},
+    lambda i: {TAG_RES_TYPE: constants.NEUTRON_NET,
+               'admin_state_up': 'True',
+               'value_specs': {'router_external': 'False',
+                               'segmentation_id': str(i % 4000),
+                               'physical_network': 'physnet1',
+                               'network_type': 'vlan'}},
+    lambda i: {TAG_RES_TYPE: constants.NEUTRON_SECGROUP,
+               'rules': json.dumps([{'id': str(j), 'direction': 'ingress',
+                                     'protocol': 'tcp',
+                                     'port_range_min': 22 + j}
+                                    for j in range(4)])},
+    lambda i: {TAG_RES_TYPE: constants.NEUTRON_FLOATINGIP,
+               'floating_network_id': 'ext-net'},
+)
+
+
+def build(count):
+    return [SAMPLES[i % len(SAMPLES)](i) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resources', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    resources = build(args.resources)
+    legacy = copy.deepcopy(resources)
+    compiled = copy.deepcopy(resources)
+    legacy_preprocess(legacy)
+    converters.preprocess_update_resources(compiled)
+    if legacy != compiled:
+        sys.exit('The compiled converters differ from the legacy chain.')
+
+    for name, preprocess in (
+            ('legacy', legacy_preprocess),
+            ('compiled', converters.preprocess_update_resources)):
+        # Converters work in place, copies are made outside of the timing.
+        copies = [copy.deepcopy(resources) for _i in range(args.repeat)]
+        best = min(timeit.repeat(lambda: preprocess(copies.pop()),
+                                 number=1, repeat=args.repeat))
+        print('%-8s %d resources: %.4fs' % (name, args.resources, best))
+
+
+if __name__ == '__main__':
+    main()